@@ -0,0 +1,89 @@
+"""
+Compares the old sequential fetch loop with ``fedplot.fetch.fetch_all``, and a
+full-history refresh of stale cached series with the store's delta updates.
+
+Everything runs against the local fake FRED API (benchmarks/fake_api.py), so every
+request costs one round trip of ``--latency`` seconds.
+
+    python benchmarks/bench_fetch.py --series 10 --latency 0.2
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_api import start_server
+from fedplot.fetch import fetch_all
+from fedplot.sources import FredSource
+from fedplot.store import SeriesStore
+
+
+def _store(root_url, **kwargs):
+    source = FredSource(api_key='benchmark', root_url=root_url)
+    return SeriesStore({'FRED': source}, cache_dir=tempfile.mkdtemp(prefix='fedplot-bench-'), **kwargs)
+
+
+def run(num_series=10, latency=0.2, repeat=3):
+    server, root_url = start_server(latency=latency)
+    series_dict = {f'SERIES_{i}': 'FRED' for i in range(num_series)}
+    results = {'sequential': [], 'concurrent': []}
+
+    try:
+        for _ in range(repeat):
+            store = _store(root_url)
+            start = time.perf_counter()
+            for series_id, source in series_dict.items():
+                store.get(source, series_id)
+            results['sequential'].append(time.perf_counter() - start)
+
+            store = _store(root_url)
+            start = time.perf_counter()
+            fetch_all(series_dict, store=store)
+            results['concurrent'].append(time.perf_counter() - start)
+    finally:
+        server.shutdown()
+
+    return {name: min(times) for name, times in results.items()}
+
+
+def run_refresh(num_series=10, latency=0.2, periods=1000):
+    """Refreshes stale cached series with full-history downloads and with delta requests."""
+    server, root_url = start_server(latency=latency, periods=periods)
+    series_dict = {f'SERIES_{i}': 'FRED' for i in range(num_series)}
+    results = {}
+
+    try:
+        for name, incremental in (('full', False), ('delta', True)):
+            store = _store(root_url, incremental=incremental)
+            fetch_all(series_dict, store=store)
+            store.ttl = 0
+            server.RequestHandlerClass.bytes_served = 0
+
+            start = time.perf_counter()
+            fetch_all(series_dict, store=store)
+            results[name] = (time.perf_counter() - start, server.RequestHandlerClass.bytes_served)
+    finally:
+        server.shutdown()
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sequential vs concurrent series fetching')
+    parser.add_argument('--series', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    timings = run(args.series, args.latency, args.repeat)
+    print(f"{args.series} series, {args.latency:.2f}s latency per request")
+    print(f"  sequential: {timings['sequential']:.3f}s")
+    print(f"  concurrent: {timings['concurrent']:.3f}s ({timings['sequential'] / timings['concurrent']:.1f}x faster)")
+
+    refresh = run_refresh(args.series, args.latency)
+    print(f"Refreshing {args.series} stale series of 1000 monthly observations")
+    for name, (seconds, size) in refresh.items():
+        print(f"  {name:>5}: {seconds:.3f}s, {size / 1024:.0f} KiB downloaded")
@@ -0,0 +1,202 @@
+"""
+Per-stage timings of the three plotting pipelines on synthetic series.
+
+Each chart of fedplot.charts is called as shipped, with a SeriesStore over a
+FakeSource (so no network), and its stages are read from the fedplot.metrics
+spans the pipeline already records: fetch (with the download inside it), merge,
+transform and render (draw and encode). A stage's time is the wall time from
+its first span's start to its last span's end, so series fetched in parallel
+are not counted twice; ``total`` is the whole chart call. The in-process caches
+are cleared before each repeat, so each stage does its full work.
+
+    python benchmarks/bench_pipeline.py --sizes 1000 10000 100000 1000000
+    python benchmarks/bench_pipeline.py --memory --profile prof/
+    python benchmarks/bench_pipeline.py --save baseline.json
+    python benchmarks/bench_pipeline.py --baseline baseline.json --threshold 1.25
+
+With ``--baseline`` the run exits with status 1 when any stage is slower than its
+baseline time times ``--threshold``. Stages faster than ``--floor`` seconds in the
+baseline are not compared, because their timings are mostly noise.
+"""
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from fedplot import metrics
+from fedplot.charts import CHARTS
+from fedplot.memo import clear_all
+from fedplot.sources import FakeSource
+from fedplot.store import SeriesStore
+
+SIZES = (1000, 10000, 100000, 1000000)
+STAGES = metrics.STAGES + ('total',)
+
+# Arguments of each chart besides the series, the store and from_date
+CASES = {
+    'plot_series': dict(title='Benchmark', legend_text_generator=['A', 'B'], year_over_year=True),
+    'plot_series_with_vlines': dict(title='Benchmark', legend_text_generator=['A'], change_in=True),
+    'plot_scatter': dict(title='Benchmark', year_cutoff=2022),
+}
+
+
+def synthetic_panel_source(size, num_series=2):
+    """FakeSource serving ``num_series`` hourly random walks of ``size`` points ending in 2024."""
+    index = pd.date_range(end='2024-12-31', periods=size, freq='h')
+    rng = np.random.default_rng(size)
+    series = {f'SERIES_{i}': pd.Series(rng.normal(size=size).cumsum() + 100, index=index) for i in range(num_series)}
+    return FakeSource(series, name='FRED'), index[0]
+
+
+def stage_seconds(spans):
+    """Wall time of every stage in ``spans``, from the start of its first span to the end of its last."""
+    seconds = {}
+    for stage in metrics.STAGES:
+        group = spans[spans['stage'] == stage]
+        if group.empty:
+            seconds[stage] = 0.0
+            continue
+        starts = group['time'] - pd.to_timedelta(group['seconds'], unit='s')
+        seconds[stage] = (group['time'].max() - starts.min()).total_seconds()
+    return seconds
+
+
+def run_chart(case, source, start):
+    """Calls the chart ``case`` once on a fresh store and empty caches and returns its stage timings."""
+    cache_dir = tempfile.mkdtemp(prefix='fedplot-bench-')
+    try:
+        clear_all()
+        metrics.reset()
+        store = SeriesStore({'FRED': source}, cache_dir=cache_dir)
+        series_dict = {series_id: 'FRED' for series_id in source.series}
+        began = time.perf_counter()
+        CHARTS[case](series_dict, from_date=start, store=store, fmt='png', **CASES[case])
+        total = time.perf_counter() - began
+        return dict(stage_seconds(metrics.spans()), total=total)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def run_case(case, size, repeat=3, memory=False, profile_dir=None, profiler='cprofile'):
+    """
+    Runs one chart ``repeat`` times on series of ``size`` points.
+
+    Returns ``{stage: seconds}`` (the fastest repeat of each stage) and, with
+    ``memory``, ``{'total': peak bytes}`` of the whole chart from one extra traced run.
+    """
+    source, start = synthetic_panel_source(size)
+    runs = [run_chart(case, source, start) for _ in range(repeat)]
+    peaks = {}
+
+    if memory:
+        # Traced separately, as tracemalloc slows the run down
+        tracemalloc.start()
+        try:
+            run_chart(case, source, start)
+            peaks['total'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    if profile_dir:
+        _profile(case, size, lambda: run_chart(case, source, start), profile_dir, profiler)
+
+    return {stage: min(run[stage] for run in runs) for stage in STAGES}, peaks
+
+
+def _profile(case, size, one_run, profile_dir, profiler):
+    os.makedirs(profile_dir, exist_ok=True)
+    name = os.path.join(profile_dir, f'{case}-{size}')
+
+    if profiler == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise SystemExit('pyinstrument is not installed (pip install pyinstrument), use --profiler cprofile')
+        profile = Profiler()
+        profile.start()
+        one_run()
+        profile.stop()
+        with open(name + '.html', 'w') as f:
+            f.write(profile.output_html())
+        return
+
+    profile = cProfile.Profile()
+    profile.enable()
+    one_run()
+    profile.disable()
+    profile.dump_stats(name + '.prof')
+    print(f'    {name}.prof, top functions by cumulative time:')
+    pstats.Stats(profile, stream=sys.stdout).sort_stats('cumulative').print_stats(8)
+
+
+def run(sizes=SIZES, cases=tuple(CASES), repeat=3, memory=False, profile_dir=None, profiler='cprofile'):
+    """Returns ``{case: {size: {'seconds': {stage: s}, 'peak_bytes': {stage: b}}}}`` and prints a table as it goes."""
+    results = {}
+    # Imports, the theme and font caches are paid once here rather than by the first timed case
+    run_case(cases[0], min(sizes), repeat=1)
+
+    print(f"{'chart':<24}{'points':>9}" + ''.join(f'{stage:>11}' for stage in STAGES))
+    for case in cases:
+        for size in sizes:
+            seconds, peaks = run_case(case, size, repeat, memory, profile_dir, profiler)
+            results.setdefault(case, {})[str(size)] = {'seconds': seconds, 'peak_bytes': peaks}
+            print(f'{case:<24}{size:>9}' + ''.join(f'{seconds[stage]:>10.3f}s' for stage in STAGES))
+            if peaks:
+                print(f"{'peak memory':>33}{peaks['total'] / 2**20:>9.1f}MB")
+    return results
+
+
+def regressions(results, baseline, threshold=1.25, floor=0.005):
+    """Stages slower than ``threshold`` times their baseline, as (case, size, stage, seconds, baseline seconds)."""
+    slower = []
+    for case, sizes in results.items():
+        for size, result in sizes.items():
+            reference = baseline.get(case, {}).get(size)
+            if reference is None:
+                continue
+            for stage, seconds in result['seconds'].items():
+                before = reference['seconds'].get(stage)
+                if before is not None and before >= floor and seconds > before * threshold:
+                    slower.append((case, size, stage, seconds, before))
+    return slower
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Per-stage timings of the plotting pipelines on synthetic series')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help='points per series')
+    parser.add_argument('--charts', nargs='+', default=list(CASES), choices=list(CASES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--memory', action='store_true', help='also report the peak memory of each chart')
+    parser.add_argument('--profile', metavar='DIR', help='write a profile of one run of every chart and size to DIR')
+    parser.add_argument('--profiler', default='cprofile', choices=['cprofile', 'pyinstrument'])
+    parser.add_argument('--save', metavar='FILE', help='write the results as JSON')
+    parser.add_argument('--baseline', metavar='FILE', help='JSON results of an earlier run to compare with')
+    parser.add_argument('--threshold', type=float, default=1.25, help='allowed slowdown against the baseline (default 1.25)')
+    parser.add_argument('--floor', type=float, default=0.005, help='baseline seconds below which a stage is not compared')
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.charts, args.repeat, args.memory, args.profile, args.profiler)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = regressions(results, json.load(f), args.threshold, args.floor)
+        for case, size, stage, seconds, before in slower:
+            print(f'REGRESSION {case} {size} points, {stage}: {seconds:.3f}s vs {before:.3f}s ({seconds / before:.2f}x)')
+        if slower:
+            raise SystemExit(1)
+        print(f'No stage is more than {args.threshold:.2f}x slower than {args.baseline}')
@@ -0,0 +1,92 @@
+"""
+Local stand-in for the FRED observations endpoint, used by the benchmarks.
+
+Every series ID returns a synthetic monthly series after a fixed delay, so fetch
+timings reflect round trips rather than the real API's load.
+
+    python benchmarks/fake_api.py --port 8765 --latency 0.2
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from fedplot.sources import synthetic_series
+
+
+def _observations_xml(series, start=None):
+    if start is not None:
+        series = series[series.index >= pd.Timestamp(start)]
+    today = time.strftime('%Y-%m-%d')
+    rows = ''.join(
+        f'<observation realtime_start="{today}" realtime_end="{today}" date="{d:%Y-%m-%d}" value="{v:.4f}"/>'
+        for d, v in series.items()
+    )
+    return f'<?xml version="1.0" encoding="utf-8"?><observations realtime_start="{today}" realtime_end="{today}" count="{len(series)}">{rows}</observations>'
+
+
+class FakeFredHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    periods = 600
+    requests_served = 0
+    bytes_served = 0
+    _lock = threading.Lock()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        with self._lock:
+            type(self).requests_served += 1
+        time.sleep(self.latency)
+
+        if not url.path.endswith('/series/observations') or 'series_id' not in query:
+            self.send_response(400)
+            self.end_headers()
+            self.wfile.write(b'<error code="400" message="Bad Request.  Unknown endpoint."/>')
+            return
+
+        series = synthetic_series(query['series_id'], periods=self.periods)
+        body = _observations_xml(series, query.get('observation_start')).encode()
+        with self._lock:
+            type(self).bytes_served += len(body)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port=0, latency=0.0, periods=600):
+    """
+    Starts the fake API on a background thread and returns ``(server, root_url)``.
+    ``server.RequestHandlerClass`` holds the request and byte counters.
+    """
+    handler = type('Handler', (FakeFredHandler,), {'latency': latency, 'periods': periods})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}/fred'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.2, help='seconds added to every response')
+    parser.add_argument('--periods', type=int, default=600, help='observations per series')
+    args = parser.parse_args()
+
+    server, root_url = start_server(args.port, args.latency, args.periods)
+    print(f'Fake FRED API at {root_url}')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
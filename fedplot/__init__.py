@@ -0,0 +1,3 @@
+"""
+Shared helpers for the FED Challenge plotting pages and notebooks.
+"""
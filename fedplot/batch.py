@@ -0,0 +1,142 @@
+"""
+Headless batch rendering of every chart defined in main.ipynb.
+
+The notebook's chart cells are read without executing them: literal assignments
+(``series_ids = {...}``, ``legend = [...]``) are evaluated with ``ast.literal_eval``
+and every top-level call to ``plot_series``, ``plot_series_with_vlines`` or
+``plot_scatter`` becomes one chart. The charts are then rendered in parallel
+across processes.
+
+    python -m fedplot.batch main.ipynb --out charts --format png --workers 4
+"""
+import argparse
+import ast
+import inspect
+import json
+import os
+import re
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from fedplot.charts import CHARTS
+
+
+def _slug(text):
+    return re.sub(r'[^a-z0-9]+', '_', text.lower())[:60].strip('_')
+
+
+def _resolve(node, env):
+    if isinstance(node, ast.Name):
+        if node.id not in env:
+            raise ValueError(f"'{node.id}' is not a literal defined in the cell")
+        return env[node.id]
+    return ast.literal_eval(node)
+
+
+def extract_charts(notebook_path):
+    """
+    Returns the charts defined in a notebook as dictionaries with 'name',
+    'function' and 'kwargs'. Calls whose arguments are not literals are skipped
+    with a warning.
+    """
+    with open(notebook_path) as f:
+        notebook = json.load(f)
+
+    charts = []
+    for cell_idx, cell in enumerate(notebook['cells']):
+        if cell['cell_type'] != 'code':
+            continue
+        try:
+            tree = ast.parse(''.join(cell['source']))
+        except SyntaxError:
+            continue
+
+        env = {}
+        for stmt in tree.body:
+            if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+                try:
+                    env[stmt.targets[0].id] = ast.literal_eval(stmt.value)
+                except ValueError:
+                    pass
+                continue
+
+            call = stmt.value if isinstance(stmt, ast.Expr) else None
+            if not (isinstance(call, ast.Call) and isinstance(call.func, ast.Name) and call.func.id in CHARTS):
+                continue
+
+            function = call.func.id
+            params = list(inspect.signature(CHARTS[function]).parameters)
+            try:
+                kwargs = {params[i]: _resolve(arg, env) for i, arg in enumerate(call.args)}
+                kwargs.update({kw.arg: _resolve(kw.value, env) for kw in call.keywords})
+            except ValueError as e:
+                warnings.warn(f"Skipping {function} in cell {cell_idx}: {e}", stacklevel=2)
+                continue
+
+            name = f"{cell_idx:02d}_{_slug(kwargs.get('title', function))}"
+            charts.append({'name': name, 'function': function, 'kwargs': kwargs})
+    return charts
+
+
+def render_one(chart, out_dir, fmt):
+    """Renders a single chart to ``out_dir/<name>.<fmt>`` and returns the path."""
+    data = CHARTS[chart['function']](**chart['kwargs'], fmt=fmt)
+    path = os.path.join(out_dir, f"{chart['name']}.{fmt}")
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def render_all(charts, out_dir, fmt='png', workers=None, base_dir='.'):
+    """
+    Renders charts in a process pool.
+
+    Parameters:
+    - charts: Charts as returned by extract_charts
+    - out_dir: Directory for the images
+    - fmt: 'png' or 'svg' (default 'png')
+    - workers: Number of processes (default is the CPU count)
+    - base_dir: Directory that FILE paths in the charts are relative to (default '.')
+
+    Returns a dictionary mapping each chart name to its image path or to the error it raised.
+    """
+    out_dir = os.path.abspath(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=os.chdir, initargs=(os.path.abspath(base_dir),)) as pool:
+        futures = {pool.submit(render_one, chart, out_dir, fmt): chart['name'] for chart in charts}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                results[futures[future]] = e
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render every chart defined in a notebook.')
+    parser.add_argument('notebook', nargs='?', default='main.ipynb')
+    parser.add_argument('--out', default='charts', help='output directory (default charts/)')
+    parser.add_argument('--format', default='png', choices=['png', 'svg'])
+    parser.add_argument('--workers', type=int, default=None, help='number of processes (default CPU count)')
+    args = parser.parse_args(argv)
+
+    charts = extract_charts(args.notebook)
+    start = time.perf_counter()
+    results = render_all(charts, args.out, args.format, args.workers, base_dir=os.path.dirname(os.path.abspath(args.notebook)))
+
+    failed = 0
+    for name in sorted(results):
+        if isinstance(results[name], Exception):
+            failed += 1
+            print(f"FAILED {name}: {results[name]}")
+        else:
+            print(f"wrote {results[name]}")
+    print(f"{len(results) - failed}/{len(results)} charts in {time.perf_counter() - start:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+"""
+Builds every chart listed in a JSON chart spec (charts.json by default).
+
+A spec is ``{"charts": [{"name": ..., "function": ..., "kwargs": {...}}, ...]}``
+where ``function`` is one of ``plot_series``, ``plot_series_with_vlines`` or
+``plot_scatter`` and ``kwargs`` are its arguments, exactly as in main.ipynb.
+
+The build fetches the union of all FRED/BLS series once into the shared series
+store, each from the earliest ``from_date`` of the charts that use it, then
+renders the charts in a process pool (the workers read the series back from the
+store's disk cache). With ``--incremental`` a chart is only
+rebuilt when its spec entry or one of its input series changed since the last
+build, as recorded in ``<out>/.build-manifest.json``.
+
+    python -m fedplot.build charts.json --out charts --incremental
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import time
+
+import pandas as pd
+
+from fedplot.batch import render_all
+from fedplot.charts import CHARTS
+from fedplot.fetch import fetch_all
+from fedplot.store import get_store
+
+MANIFEST = '.build-manifest.json'
+
+
+def load_spec(path):
+    """Reads a chart spec and checks every entry names a known chart function."""
+    with open(path) as f:
+        charts = json.load(f)['charts']
+
+    names = set()
+    for chart in charts:
+        if chart['function'] not in CHARTS:
+            raise ValueError(f"Chart '{chart['name']}' uses unknown function '{chart['function']}'. Use one of {', '.join(CHARTS)}.")
+        if chart['name'] in names:
+            raise ValueError(f"Chart name '{chart['name']}' is used twice.")
+        names.add(chart['name'])
+    return charts
+
+
+def _from_date(chart):
+    # The chart's own from_date, or the default of its function
+    from_date = chart['kwargs'].get('from_date')
+    if from_date is None:
+        from_date = inspect.signature(CHARTS[chart['function']]).parameters['from_date'].default
+    return pd.Timestamp(from_date)
+
+
+def required_series(charts):
+    """
+    Returns the union of the FRED/BLS series the charts need, grouped by source
+    and by the earliest ``from_date`` of the charts using each series, as
+    ``{(source, start): series_dict}`` (the same ID can be requested from both
+    FRED and BLS).
+    """
+    starts = {}
+    for chart in charts:
+        from_date = _from_date(chart)
+        for series_id, source in chart['kwargs']['series_dict'].items():
+            if source in ('FRED', 'BLS'):
+                key = (source, series_id)
+                starts[key] = min(starts.get(key, from_date), from_date)
+
+    series = {}
+    for (source, series_id), start in starts.items():
+        series.setdefault((source, start), {})[series_id] = source
+    return series
+
+
+def fingerprint(chart, fmt, store, base_dir='.'):
+    """
+    Hash of a chart's spec entry and the current state of its inputs: the store
+    checksum for FRED/BLS series, and the size and mtime for FILE sources.
+    """
+    h = hashlib.sha1(json.dumps(chart, sort_keys=True).encode())
+    h.update(fmt.encode())
+    for series_id, source in sorted(chart['kwargs']['series_dict'].items()):
+        if source == 'FILE':
+            stat = os.stat(os.path.join(base_dir, series_id))
+            h.update(f'|{series_id}:{stat.st_size}:{stat.st_mtime_ns}'.encode())
+        else:
+            info = store.info(source, series_id) or {}
+            h.update(f"|{source}:{series_id}:{info.get('checksum')}".encode())
+    return h.hexdigest()
+
+
+def _read_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def build(spec_path, out_dir='charts', fmt='png', workers=None, incremental=False, store=None):
+    """
+    Builds the charts of a spec.
+
+    Parameters:
+    - spec_path: Path of the JSON spec; FILE sources are relative to its directory
+    - out_dir: Directory for the images (default 'charts')
+    - fmt: 'png' or 'svg' (default 'png')
+    - workers: Number of render processes (default is the CPU count)
+    - incremental: Skip charts whose fingerprint matches the last build (default False)
+    - store: SeriesStore used for the up-front fetch (default is the shared store, which the render workers read from)
+
+    Returns a dictionary mapping each chart name to its image path, to the error
+    it raised, or to None when an incremental build skipped it as unchanged.
+    """
+    store = store or get_store()
+    base_dir = os.path.dirname(os.path.abspath(spec_path))
+    charts = load_spec(spec_path)
+
+    # Fetch every series once, from the earliest date any chart shows it, before any chart is rendered
+    errors = {}
+    for (source, start), series_dict in required_series(charts).items():
+        _, source_errors = fetch_all(series_dict, store=store, start=start, raise_errors=False)
+        errors.update({(source, series_id): e for series_id, e in source_errors.items()})
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = _read_manifest(out_dir) if incremental else {}
+    results, pending, prints = {}, [], {}
+    for chart in charts:
+        failed = [(source, series_id) for series_id, source in chart['kwargs']['series_dict'].items() if (source, series_id) in errors]
+        if failed:
+            results[chart['name']] = ValueError(f"Error fetching {failed[0][0]} series {failed[0][1]}: {errors[failed[0]]}")
+            continue
+
+        prints[chart['name']] = fingerprint(chart, fmt, store, base_dir)
+        path = os.path.join(out_dir, f"{chart['name']}.{fmt}")
+        if incremental and manifest.get(chart['name']) == prints[chart['name']] and os.path.exists(path):
+            results[chart['name']] = None
+        else:
+            pending.append(chart)
+
+    if pending:
+        results.update(render_all(pending, out_dir, fmt, workers, base_dir=base_dir))
+
+    for name, result in results.items():
+        if isinstance(result, str):
+            manifest[name] = prints[name]
+        elif isinstance(result, Exception):
+            manifest.pop(name, None)
+    _write_manifest(out_dir, manifest)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build every chart in a chart spec.')
+    parser.add_argument('spec', nargs='?', default='charts.json')
+    parser.add_argument('--out', default='charts', help='output directory (default charts/)')
+    parser.add_argument('--format', default='png', choices=['png', 'svg'])
+    parser.add_argument('--workers', type=int, default=None, help='number of processes (default CPU count)')
+    parser.add_argument('--incremental', action='store_true', help='only rebuild charts whose spec or data changed')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = build(args.spec, args.out, args.format, args.workers, args.incremental)
+
+    built = skipped = failed = 0
+    for name in sorted(results):
+        result = results[name]
+        if result is None:
+            skipped += 1
+        elif isinstance(result, Exception):
+            failed += 1
+            print(f"FAILED {name}: {result}")
+        else:
+            built += 1
+            print(f"wrote {result}")
+    print(f"{built} built, {skipped} unchanged, {failed} failed in {time.perf_counter() - start:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+"""
+The notebook's plotting functions as load -> transform -> render pipelines.
+
+Each function takes the same arguments as its counterpart in main.ipynb and
+returns the rendered image bytes, so charts can be produced without Streamlit or
+Jupyter (see ``fedplot.batch`` and ``fedplot.serve``). ``fmt='json'`` returns the
+plotted data instead of an image, and ``store`` fetches FRED/BLS series through
+another SeriesStore than the shared one.
+"""
+import pandas as pd
+
+from fedplot.data import load_panel
+from fedplot.frequency import transform_periods
+from fedplot.projections import SEP_SERIES, actuals, fan, load_projections
+from fedplot.render import render_chart
+from fedplot.transforms import apply_transforms, transform_chain
+
+
+def plot_series(series_dict, title, legend_text_generator, from_date='2000-01-01', x_label='Date', y_label='Series Value',
+                change_in=False, plot_type=None, legend_loc='upper right', percent_change=False, year_over_year=False,
+                periods_in_year=None, custom_text='Source: Federal Reserve Economic Data', marker='o', fmt='png', store=None,
+                freq=None, how='last'):
+    """
+    Line plot of one or more FRED, BLS or FILE series. With ``freq`` the series are
+    first resampled to one frequency, each aggregated with ``how``, and the
+    transforms use every series' own periods per year instead of ``periods_in_year``.
+    """
+    merged_df = load_panel(series_dict, from_date, store=store, freq=freq, how=how)
+    merged_df = apply_transforms(merged_df, transform_chain(change_in, percent_change, year_over_year),
+                                 transform_periods(merged_df, freq, periods_in_year))
+    return render_chart('line', merged_df, fmt, title=title, legend_text_generator=legend_text_generator,
+                        x_label=x_label, y_label=y_label, legend_loc=legend_loc, custom_text=custom_text,
+                        marker=marker, plot_type=plot_type, sources=tuple(sorted(set(series_dict.values()))))
+
+
+def plot_series_with_vlines(series_dict, title, legend_text_generator, from_date='2000-01-01', x_label='Date',
+                            y_label='Series Value', change_in=False, legend_loc='upper right', percent_change=False,
+                            line_width=10, year_over_year=False, periods_in_year=None, fmt='png', store=None,
+                            freq=None, how='last'):
+    """Series drawn as vertical lines to the x-axis, like a bar plot. ``freq`` and ``how`` as in plot_series."""
+    merged_df = load_panel(series_dict, from_date, store=store, freq=freq, how=how)
+    merged_df = apply_transforms(merged_df, transform_chain(change_in, percent_change, year_over_year),
+                                 transform_periods(merged_df, freq, periods_in_year))
+    return render_chart('vlines', merged_df, fmt, title=title, legend_text_generator=legend_text_generator,
+                        x_label=x_label, y_label=y_label, legend_loc=legend_loc, line_width=line_width,
+                        sources=tuple(sorted(set(series_dict.values()))))
+
+
+def plot_scatter(series_dict, title, legend_text_generator=None, from_date='2000-01-01', x_label='Unemployment Rate',
+                 y_label='Vacancy Rate', year_cutoff=2022, legend_loc='upper right',
+                 custom_text='Source: Federal Reserve Economic Data', add_line=False, bucket_years=2, fmt='png', store=None):
+    """
+    Scatter of the first series against the second, e.g. a Beveridge curve. Further
+    pairs of series (third against fourth, ...) are added with other markers.
+    """
+    merged_df = load_panel(series_dict, from_date, store=store)
+    return render_chart('scatter', merged_df, fmt, title=title, x_label=x_label, y_label=y_label,
+                        year_cutoff=year_cutoff, legend_loc=legend_loc, custom_text=custom_text, add_line=add_line,
+                        bucket_years=bucket_years, legend_text_generator=legend_text_generator)
+
+
+def plot_projections(variable, title, release=None, from_date='2015-01-01', history=True, x_label='Date',
+                     y_label='Percent', legend_loc='upper left',
+                     custom_text='Source: Federal Reserve Summary of Economic Projections', fmt='png', store=None):
+    """
+    Fan chart of the FOMC's projections of an SEP variable (e.g. 'Unemployment
+    rate') from one release, after its history. With ``history`` the history is the
+    matching FRED series (see projections.SEP_SERIES); otherwise it is the annual
+    actuals published with the release.
+    """
+    table = load_projections()
+    years, longer_run = fan(table, variable, release)
+
+    from_date = pd.Timestamp(from_date)
+    if history and variable in SEP_SERIES:
+        series_id, chain = SEP_SERIES[variable]
+        # A year more than shown, so year-over-year changes start at from_date
+        panel = load_panel({series_id: 'FRED'}, from_date - pd.DateOffset(years=1), store=store)
+        panel = apply_transforms(panel, chain)
+        panel = panel[panel['Date'] >= from_date].reset_index(drop=True)
+        legend_text = (f'{series_id} (FRED)',)
+    else:
+        published = actuals(table, variable, release)
+        panel = pd.DataFrame({'Date': pd.to_datetime([f'{year}-12-31' for year in published.index]),
+                              'Value_0': published.to_numpy()})
+        panel = panel[panel['Date'] >= from_date].reset_index(drop=True)
+        legend_text = ('Actual',)
+
+    return render_chart('fan', panel, fmt, title=title, fan=tuple(years.itertuples(name=None)),
+                        longer_run=None if longer_run is None else tuple(longer_run),
+                        legend_text_generator=legend_text, x_label=x_label, y_label=y_label,
+                        legend_loc=legend_loc, custom_text=custom_text)
+
+
+CHARTS = {
+    'plot_series': plot_series,
+    'plot_series_with_vlines': plot_series_with_vlines,
+    'plot_scatter': plot_scatter,
+    'plot_projections': plot_projections,
+}
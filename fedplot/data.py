@@ -0,0 +1,110 @@
+"""
+Loading and aligning the series behind every plot.
+
+This replaces the fetch -> DataFrame -> ``Date`` filter -> ``pd.merge`` loop that
+was copied into each page and into main.ipynb. All series are fetched together
+and joined with a single index-aligned ``pd.concat`` instead of one pairwise
+merge per series. Aligned panels are memoized on the series, their versions and
+the date range, so a repeat plot of unchanged data skips the join.
+"""
+import os
+
+import pandas as pd
+
+from fedplot import metrics
+from fedplot.fetch import fetch_all
+from fedplot.files import load_file
+from fedplot.frequency import resample_panel
+from fedplot.memo import LRUCache
+from fedplot.store import get_store
+
+_cache = LRUCache('align', max_entries=32)
+
+
+def load_frame(series_id, source, idx, fetched):
+    """
+    Returns the DataFrame for one entry of ``series_dict``.
+
+    FRED/BLS series become a single ``Value_{idx}`` column; FILE sources are CSVs
+    whose first column is the date and whose other columns are kept as they are,
+    loaded from their columnar cache (see fedplot.files).
+    """
+    if source in ('FRED', 'BLS'):
+        return fetched[series_id].to_frame(f"Value_{idx}")
+    if source == 'FILE':
+        return load_file(series_id)
+    raise ValueError(f"Invalid source '{source}' for series {series_id}. Use 'FRED', 'BLS' or 'FILE'.")
+
+
+def align(frames, join='inner'):
+    """
+    Joins date-indexed frames on their index in one pass.
+
+    Returns a DataFrame with a ``Date`` column followed by every value column and a
+    plain RangeIndex, the shape the plotting functions work with.
+    """
+    frames = [frame[~frame.index.duplicated(keep='last')] for frame in frames]
+    merged = pd.concat(frames, axis=1, join=join, sort=True)
+    merged.index.name = 'Date'
+    return merged.reset_index()
+
+
+def _versions(series_dict, store):
+    # Checksum of each cached FRED/BLS series and size/mtime of each file, so a new vintage misses the cache
+    versions = []
+    for series_id, source in series_dict.items():
+        if source == 'FILE':
+            stat = os.stat(series_id)
+            versions.append((stat.st_size, stat.st_mtime_ns))
+        else:
+            versions.append((store.info(source, series_id) or {}).get('checksum'))
+    return tuple(versions)
+
+
+def data_version(series_dict, from_date='2000-01-01', store=None):
+    """
+    Version of the data ``load_panel`` would align for ``series_dict``: the store
+    checksum of each FRED/BLS series and the size and mtime of each file. Stale
+    series are refreshed first, so a new vintage changes the version.
+    """
+    store = store or get_store()
+    fetch_all(series_dict, store=store, start=pd.Timestamp(from_date))
+    return _versions(series_dict, store)
+
+
+def load_panel(series_dict, from_date='2000-01-01', store=None, join='inner', freq=None, how='last'):
+    """
+    Fetches every series in ``series_dict`` and aligns them on their dates.
+
+    Parameters:
+    - series_dict: Dictionary where keys are series IDs (or CSV paths) and values are the source ('FRED', 'BLS' or 'FILE')
+    - from_date: Observations before this date are dropped (default is '2000-01-01')
+    - store: SeriesStore used for FRED/BLS fetches (default is the shared store)
+    - join: 'inner' keeps only dates every series has, like the old merge; 'outer' keeps all dates
+    - freq: Resample every series to this frequency ('MS', 'QS', ...) or to the coarsest one ('auto') before
+      joining, so mixed frequencies line up (default None joins on exact dates); see fedplot.frequency
+    - how: Aggregation used by ``freq``, for every series or as a dictionary by column (default 'last')
+    """
+    from_date = pd.Timestamp(from_date)
+    store = store or get_store()
+    fetched, _ = fetch_all(series_dict, store=store, start=from_date)
+
+    hows = tuple(sorted(how.items())) if isinstance(how, dict) else how
+    key = (tuple(series_dict.items()), from_date, join, freq, hows, _versions(series_dict, store))
+    with metrics.span('merge', ','.join(series_dict)) as span:
+        panel = _cache.get(key)
+        if panel is None:
+            frames = []
+            for idx, (series_id, source) in enumerate(series_dict.items()):
+                frame = load_frame(series_id, source, idx, fetched)
+                frames.append(frame[frame.index >= from_date])
+            if freq is None:
+                panel = align(frames, join=join)
+            else:
+                # Keep every observation until each series is on the common frequency
+                panel = resample_panel(align(frames, join='outer'), freq, how, join)
+            _cache.put(key, panel)
+        span['rows'] = len(panel)
+
+    # Callers may modify the panel, so the cached one is never handed out
+    return panel.copy()
@@ -0,0 +1,93 @@
+"""
+Decimation of long series before they are drawn.
+
+A figure is about a thousand pixels wide, so a daily series since 1950 (tens of
+thousands of points) is mostly drawn on top of itself. Lines are reduced with
+Largest-Triangle-Three-Buckets, which keeps the points that shape the curve
+(peaks, troughs and turns), and vertical-line "bar" charts keep the lowest and
+highest observation of every pixel column, so their envelope is unchanged. Both
+return the rows to draw, and a series already shorter than the limit is
+returned as it is.
+"""
+import numpy as np
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype('int64').astype('float64')
+    return x.astype('float64')
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Indices of the ``n_out`` points Largest-Triangle-Three-Buckets keeps from
+    ``(x, y)``, where ``x`` is sorted. The first and last points are always kept.
+    """
+    x, y = _as_float(x), _as_float(y)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket i covers points edges[i]:edges[i + 1]; the first and last points are buckets of their own
+    edges = np.floor(np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    # Average point of every bucket from cumulative sums, so the loop only does the triangle areas
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    counts = np.diff(edges)
+    avg_x = np.append((cum_x[edges[1:]] - cum_x[edges[:-1]]) / counts, x[-1])
+    avg_y = np.append((cum_y[edges[1:]] - cum_y[edges[:-1]]) / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Twice the area of the triangle (previous point, candidate, average of the next bucket)
+        area = np.abs((x[a] - avg_x[i + 1]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i + 1] - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(x, y, n_buckets):
+    """
+    Indices of the lowest and highest ``y`` in each of ``n_buckets`` equal-width
+    ranges of ``x`` (sorted), in order. At most ``2 * n_buckets`` points are kept.
+    """
+    x, y = _as_float(x), _as_float(y)
+    n = len(x)
+    if n <= 2 * n_buckets or n == 0 or x[-1] == x[0]:
+        return np.arange(n)
+
+    buckets = np.minimum(((x - x[0]) / (x[-1] - x[0]) * n_buckets).astype(np.int64), n_buckets - 1)
+    # Sorted by bucket then value, the first row of each bucket is its minimum and the last its maximum
+    order = np.lexsort((y, buckets))
+    starts = np.flatnonzero(np.r_[True, np.diff(buckets[order]) != 0])
+    ends = np.r_[starts[1:], n] - 1
+    return np.unique(np.concatenate((order[starts], order[ends])))
+
+
+def thin(frame, column, n_out, method='lttb', x='Date'):
+    """
+    Rows of ``frame`` to draw for ``column`` against ``x``, keeping at most about
+    ``n_out`` of them. Rows where ``column`` is missing are dropped first when the
+    frame is decimated.
+
+    method: 'lttb' for lines, 'minmax' for vertical lines/bars (n_out / 2 pixel buckets)
+    """
+    if len(frame) <= n_out:
+        return frame
+    frame = frame[[x, column]].dropna()
+    if method == 'minmax':
+        keep = minmax_indices(frame[x].to_numpy(), frame[column].to_numpy(), max(1, n_out // 2))
+    else:
+        keep = lttb_indices(frame[x].to_numpy(), frame[column].to_numpy(), n_out)
+    return frame.iloc[keep]
+
+
+def pixel_width(ax):
+    """Width of the axes in display pixels."""
+    return max(1, int(ax.get_window_extent().width))
@@ -0,0 +1,63 @@
+"""
+Aggregating daily rate changes into one net move per period.
+
+fed_funds.ipynb built its monthly rate-change table with nested year/month loops,
+scanning the whole DataFrame twice per month. ``net_moves`` does the same in one
+grouped pass for any date range and for weekly, monthly, quarterly or
+per-FOMC-meeting periods.
+
+The "net move" rule is the notebook's: a period whose changes are all cuts (max
+is 0) reports its largest cut, one whose changes are all hikes (min is 0) reports
+its largest hike, and a period with both, or with no observations, reports 0.
+"""
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+from fedplot.files import load_file
+
+FREQUENCIES = {'Weekly': 'W-MON', 'Monthly': 'MS', 'Quarterly': 'QS', 'Per FOMC meeting': 'fomc'}
+
+
+def fomc_meetings(path='data/fomc_meedtings.csv'):
+    """Returns the FOMC meeting table (RateMove and RateTarget in basis points) indexed by meeting month."""
+    return load_file(path)
+
+
+def _net(mins, maxs):
+    return np.where(maxs == 0, mins, np.where(mins == 0, maxs, 0.0))
+
+
+def net_moves(changes, start=None, end=None, freq='MS', meetings=None):
+    """
+    Net move of a daily change series in every period between ``start`` and ``end``.
+
+    Parameters:
+    - changes: Series of daily changes indexed by date (the Change column of fed_funds.csv)
+    - start, end: Date range to aggregate (default is the range of ``changes``)
+    - freq: A pandas frequency such as 'W-MON', 'MS' or 'QS', or 'fomc' for one period per meeting
+    - meetings: Meeting dates for freq='fomc' (default is the index of data/fomc_meedtings.csv)
+
+    Returns a DataFrame with a 'Date' column (the start of each period) and a 'Change' column.
+    """
+    changes = changes.sort_index()
+    start = pd.Timestamp(start) if start is not None else changes.index[0]
+    end = pd.Timestamp(end) if end is not None else changes.index[-1]
+    changes = changes[(changes.index >= start) & (changes.index <= end)]
+
+    if freq == 'fomc':
+        meetings = pd.DatetimeIndex(meetings if meetings is not None else fomc_meetings().index).sort_values()
+        # Meetings are dated by month, so keep the meeting in the month of ``start``
+        periods = meetings[(meetings >= start.to_period('M').start_time) & (meetings <= end)]
+    else:
+        periods = pd.date_range(to_offset(freq).rollback(start.normalize()), end, freq=freq)
+
+    # Each day belongs to the last period starting on or before it
+    buckets = np.searchsorted(periods.values, changes.index.values, side='right') - 1
+    keep = buckets >= 0
+    grouped = changes[keep].groupby(buckets[keep])
+    mins = grouped.min().reindex(range(len(periods))).to_numpy(dtype='float64')
+    maxs = grouped.max().reindex(range(len(periods))).to_numpy(dtype='float64')
+
+    moves = np.nan_to_num(_net(mins, maxs), nan=0.0)
+    return pd.DataFrame({'Date': periods, 'Change': moves})
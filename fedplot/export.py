@@ -0,0 +1,241 @@
+"""
+Bulk export of aligned panels of many series to partitioned Parquet or Arrow files.
+
+``plot_series`` inner-merges its series and throws the panel away after plotting.
+``export_panel`` builds the same kind of panel for hundreds of series, with a
+choice of join:
+
+- ``inner`` - only dates every series has, like the plots
+- ``outer`` - every date any series has, missing values left empty
+- ``asof`` - a regular ``freq`` calendar (e.g. 'MS', 'QS', 'W-FRI'), each series
+  taking its last observation on or before every date
+
+With ``freq`` set, inner and outer joins first resample each series to that
+frequency with ``how`` ('last', 'mean', 'sum', ...; see fedplot.frequency).
+
+Memory stays bounded however many series or how much history is requested:
+series are fetched ``chunk_series`` at a time and written, already aligned, into
+a disk-backed NumPy column block, and the panel is then written out
+``chunk_rows`` dates at a time as ``<out>/year=YYYY/part-NNNNN.parquet`` (or
+``.arrow``), a Hive-partitioned dataset that pyarrow, pandas and DuckDB read
+as one table.
+
+    python -m fedplot.export EMRATIO LNS14000000:BLS JTSJOR UNRATE --join asof --freq MS --out panel
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from fedplot.fetch import fetch_all
+from fedplot.files import load_file
+from fedplot.frequency import AGGREGATIONS, resample_frame
+from fedplot.store import get_store
+
+JOINS = ('inner', 'outer', 'asof')
+FORMATS = ('parquet', 'arrow')
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _frames(series_dict, store, start, chunk_series):
+    """
+    Yields ``(series_id, source, frame)`` for every entry of ``series_dict``, with
+    FRED/BLS series fetched ``chunk_series`` at a time. A FRED/BLS series becomes a
+    column named by its ID, a FILE source keeps its own columns. Series that failed
+    to fetch are yielded with their exception instead of a frame.
+    """
+    for chunk in _chunks(list(series_dict.items()), chunk_series):
+        fetched, errors = fetch_all(dict(chunk), store=store, start=start, raise_errors=False)
+        for series_id, source in chunk:
+            if series_id in errors:
+                yield series_id, source, errors[series_id]
+            elif source == 'FILE':
+                yield series_id, source, load_file(series_id)
+            elif source in ('FRED', 'BLS'):
+                yield series_id, source, fetched[series_id].to_frame(series_id)
+            else:
+                yield series_id, source, ValueError(f"Invalid source '{source}' for series {series_id}. Use 'FRED', 'BLS' or 'FILE'.")
+        del fetched
+
+
+def _convert(frame, start, join, freq, how):
+    # Sorted, deduplicated observations from ``start`` on, resampled to ``freq`` for inner/outer joins
+    frame = frame[frame.index >= start]
+    frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+    if freq is not None and join != 'asof':
+        frame = resample_frame(frame, freq, how).dropna(how='all')
+    return frame
+
+
+def _target_index(indexes, join, freq, start):
+    if join == 'asof':
+        firsts = [index[0] for index in indexes if len(index)]
+        lasts = [index[-1] for index in indexes if len(index)]
+        if not firsts:
+            return pd.DatetimeIndex([], name='Date')
+        first = pd.date_range(min(firsts), periods=1, freq=freq)[0]
+        return pd.date_range(max(first, start), max(lasts), freq=freq, name='Date')
+
+    target = None
+    for index in indexes:
+        if target is None:
+            target = index
+        elif join == 'inner':
+            target = target.intersection(index)
+        else:
+            target = target.union(index)
+    return pd.DatetimeIndex([] if target is None else target, name='Date')
+
+
+def _write(frame, path, fmt):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(table, path)
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, path, compression='uncompressed')
+
+
+def export_panel(series_dict, out_dir, join='outer', freq=None, from_date='1900-01-01', fmt='parquet',
+                 chunk_series=50, chunk_rows=100_000, partition=True, store=None, how='last'):
+    """
+    Aligns every series in ``series_dict`` and writes the panel to ``out_dir``.
+
+    Parameters:
+    - series_dict: Dictionary where keys are series IDs (or CSV paths) and values are the source ('FRED', 'BLS' or 'FILE')
+    - out_dir: Directory for the dataset
+    - join: 'inner', 'outer' or 'asof' (default 'outer')
+    - freq: Target pandas frequency; required for 'asof', optional for 'inner'/'outer' (default None keeps the native dates)
+    - from_date: Observations before this date are dropped (default is '1900-01-01')
+    - fmt: 'parquet' or 'arrow' (default 'parquet')
+    - chunk_series: Number of series fetched and aligned at a time (default 50)
+    - chunk_rows: Number of dates written per file (default 100,000)
+    - partition: Write one ``year=YYYY`` directory per year (default True); otherwise files go straight into ``out_dir``
+    - store: SeriesStore used for FRED/BLS fetches (default is the shared store)
+    - how: Aggregation used by ``freq`` for inner/outer joins, for every series or as a dictionary by column (default 'last')
+
+    Returns a dictionary with the number of ``rows``, the ``columns``, the written
+    ``files`` and the ``errors`` of series that could not be fetched (left out of
+    the panel).
+    """
+    if join not in JOINS:
+        raise ValueError(f"Unknown join '{join}'. Use one of {', '.join(JOINS)}.")
+    if join == 'asof' and freq is None:
+        raise ValueError("An 'asof' join needs a target frequency, e.g. freq='MS'.")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'. Use one of {', '.join(FORMATS)}.")
+    store = store or get_store()
+    start = pd.Timestamp(from_date)
+
+    # First pass: only the dates and column names of each series are kept
+    indexes, columns, errors = [], [], {}
+    for series_id, source, frame in _frames(series_dict, store, start, chunk_series):
+        if isinstance(frame, Exception):
+            errors[series_id] = frame
+            continue
+        indexes.append(_convert(frame, start, join, freq, how).index)
+        columns.extend(frame.columns)
+    target = _target_index(indexes, join, freq, start)
+    del indexes
+
+    duplicated = pd.Index(columns)[pd.Index(columns).duplicated()]
+    if len(duplicated):
+        raise ValueError(f"Column '{duplicated[0]}' is exported twice. Every series and FILE column needs its own name.")
+    files = []
+    if not len(target) or not columns:
+        return {'rows': 0, 'columns': columns, 'files': files, 'errors': errors}
+
+    with tempfile.TemporaryDirectory(prefix='fedplot-export-') as scratch:
+        # Column-major, so each series is written as one contiguous run
+        block = np.lib.format.open_memmap(os.path.join(scratch, 'panel.npy'), mode='w+', dtype='float64',
+                                          shape=(len(target), len(columns)), fortran_order=True)
+
+        # Second pass: the series are read back from the store and aligned onto the target dates
+        position = 0
+        for series_id, source, frame in _frames(series_dict, store, start, chunk_series):
+            if series_id in errors:
+                continue
+            if isinstance(frame, Exception):
+                # Fetched a moment ago, so the panel would silently lose a column
+                raise frame
+            frame = _convert(frame, start, join, freq, how)
+            if join == 'asof':
+                aligned = frame.reindex(target, method='ffill')
+            else:
+                aligned = frame.reindex(target)
+            block[:, position:position + aligned.shape[1]] = aligned.to_numpy(dtype='float64')
+            position += aligned.shape[1]
+        block.flush()
+
+        for number, rows in enumerate(_chunks(range(len(target)), chunk_rows)):
+            chunk = pd.DataFrame(np.asarray(block[rows.start:rows.stop]), columns=columns)
+            chunk.insert(0, 'Date', target[rows.start:rows.stop])
+            groups = chunk.groupby(chunk['Date'].dt.year, sort=True) if partition else [(None, chunk)]
+            for year, part in groups:
+                directory = out_dir if year is None else os.path.join(out_dir, f'year={year}')
+                path = os.path.join(directory, f'part-{number:05d}.{fmt}')
+                _write(part, path, fmt)
+                files.append(path)
+        del block
+
+    return {'rows': len(target), 'columns': columns, 'files': files, 'errors': errors}
+
+
+def parse_series(specs):
+    """Turns 'UNRATE', 'LNS14000000:BLS' or 'data/OUTMS.csv:FILE' into a series_dict (FRED by default)."""
+    series_dict = {}
+    for spec in specs:
+        series_id, sep, source = spec.strip().rpartition(':')
+        if not sep:
+            series_id, source = source, 'FRED'
+        if series_id:
+            series_dict[series_id] = source.upper()
+    return series_dict
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export an aligned panel of many series to Parquet/Arrow.')
+    parser.add_argument('series', nargs='*', help="series IDs, optionally with a source: UNRATE, LNS14000000:BLS, data/OUTMS.csv:FILE")
+    parser.add_argument('--ids-file', help='file with one series per line, in the same form')
+    parser.add_argument('--out', default='panel', help='output directory (default panel/)')
+    parser.add_argument('--join', default='outer', choices=JOINS)
+    parser.add_argument('--freq', default=None, help="target frequency, e.g. MS, QS, W-FRI (required for --join asof)")
+    parser.add_argument('--how', default='last', choices=AGGREGATIONS, help='aggregation used by --freq for inner/outer joins (default last)')
+    parser.add_argument('--from-date', default='1900-01-01')
+    parser.add_argument('--format', default='parquet', choices=FORMATS)
+    parser.add_argument('--chunk-series', type=int, default=50, help='series fetched at a time (default 50)')
+    parser.add_argument('--chunk-rows', type=int, default=100_000, help='dates per file (default 100000)')
+    parser.add_argument('--no-partition', action='store_true', help='do not split the files into year=YYYY directories')
+    args = parser.parse_args(argv)
+
+    specs = list(args.series)
+    if args.ids_file:
+        with open(args.ids_file) as f:
+            specs.extend(line for line in f if line.strip() and not line.startswith('#'))
+    series_dict = parse_series(specs)
+    if not series_dict:
+        parser.error('no series given')
+
+    start = time.perf_counter()
+    result = export_panel(series_dict, args.out, args.join, args.freq, args.from_date, args.format,
+                          args.chunk_series, args.chunk_rows, not args.no_partition, how=args.how)
+    for series_id, error in result['errors'].items():
+        print(f"FAILED {series_id}: {error}")
+    print(f"{result['rows']} dates x {len(result['columns'])} series in {len(result['files'])} files "
+          f"under {args.out} in {time.perf_counter() - start:.1f}s")
+    return 1 if result['errors'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
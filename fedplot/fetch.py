@@ -0,0 +1,102 @@
+"""
+Concurrent fetching of several series at once.
+
+The pages used to fetch each entry of ``series_dict`` one after another, so a plot
+waited for the sum of all the round trips. ``fetch_all`` submits every FRED/BLS
+series to a thread pool, caps how many requests run against each source at the
+same time and retries transient failures with exponential backoff.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fedplot.store import get_store
+
+# Requests allowed in flight per source. BLS throttles much harder than FRED.
+SOURCE_CONCURRENCY = {'FRED': 8, 'BLS': 2}
+DEFAULT_CONCURRENCY = 4
+
+_TRANSIENT_MESSAGES = ('too many requests', 'rate limit', 'timed out', 'timeout', 'temporarily',
+                       'internal server error', 'bad gateway', 'service unavailable', 'request_not_processed')
+
+
+def is_transient(exc):
+    """
+    Returns True for errors worth retrying: network failures and the rate-limit or
+    server-side errors that fredapi and bls report as ValueError/RuntimeError.
+    """
+    if isinstance(exc, (OSError, TimeoutError)):
+        return True
+    message = str(exc).lower()
+    return any(text in message for text in _TRANSIENT_MESSAGES)
+
+
+class FetchErrors(ValueError):
+    """Raised by ``fetch_all(..., raise_errors=True)`` with the error of every series that failed."""
+
+    def __init__(self, errors, series_dict):
+        self.errors = errors
+        self.series_dict = series_dict
+        lines = [f"Error fetching {series_dict[series_id]} series {series_id}: {exc}" for series_id, exc in errors.items()]
+        super().__init__('\n'.join(lines))
+
+    def __reduce__(self):
+        # Keep the exception picklable so it can cross process boundaries (see fedplot.batch)
+        return type(self), (self.errors, self.series_dict)
+
+
+def _fetch_one(store, source, series_id, start, semaphore, retries, backoff):
+    attempt = 0
+    while True:
+        with semaphore:
+            try:
+                return store.get(source, series_id, start=start)
+            except Exception as exc:
+                if attempt >= retries or not is_transient(exc):
+                    raise
+        # Sleep outside the semaphore so other series of this source can use the slot
+        time.sleep(backoff * (2 ** attempt))
+        attempt += 1
+
+
+def fetch_all(series_dict, store=None, start=None, retries=3, backoff=0.5, concurrency=None, raise_errors=True):
+    """
+    Fetches every FRED/BLS entry of ``series_dict`` concurrently.
+
+    Parameters:
+    - series_dict: Dictionary where keys are series IDs and values are the source ('FRED' or 'BLS'); other sources are skipped
+    - store: SeriesStore used for the fetches (default is the shared store)
+    - start: Only observations from this date on are needed (default None fetches the full history)
+    - retries: How many times a transient error is retried (default 3)
+    - backoff: Seconds to wait before the first retry, doubled on each further retry (default 0.5)
+    - concurrency: Dictionary overriding SOURCE_CONCURRENCY
+    - raise_errors: Raise FetchErrors if any series failed (default True)
+
+    Returns a tuple ``(data, errors)`` of dictionaries keyed by series ID: the fetched
+    pandas Series and the exception of every series that failed.
+    """
+    store = store or get_store()
+    limits = dict(SOURCE_CONCURRENCY, **(concurrency or {}))
+    requests = [(series_id, source) for series_id, source in series_dict.items() if source in ('FRED', 'BLS')]
+    if not requests:
+        return {}, {}
+
+    semaphores = {source: threading.BoundedSemaphore(limits.get(source, DEFAULT_CONCURRENCY))
+                  for _, source in requests}
+    workers = min(len(requests), sum(limits.get(source, DEFAULT_CONCURRENCY) for source in semaphores))
+
+    data, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fetch') as pool:
+        futures = {
+            pool.submit(_fetch_one, store, source, series_id, start, semaphores[source], retries, backoff): (series_id, source)
+            for series_id, source in requests
+        }
+        for future, (series_id, source) in futures.items():
+            try:
+                data[series_id] = future.result()
+            except Exception as exc:
+                errors[series_id] = exc
+
+    if errors and raise_errors:
+        raise FetchErrors(errors, series_dict)
+    return data, errors
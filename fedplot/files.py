@@ -0,0 +1,147 @@
+"""
+Columnar cache for the CSV files bundled in data/.
+
+The FILE source used to call ``pd.read_csv(..., parse_dates=True)`` on every plot,
+inferring the date format row by row from a mix of ``1/3/05``, ``31-Jan-1998``,
+``Jan-22`` and bare years. Here each file is parsed once with an explicit date
+format and written as NumPy arrays (a ``datetime64[ns]`` index plus a 2-D float
+block) under ``.cache/files``. Later loads memory-map those arrays, so nothing is
+re-parsed or copied until a transform writes to the data.
+
+The cache is rebuilt only when the CSV changes: an unchanged size and mtime is
+trusted, and a touched file whose content hash is unchanged is not re-parsed.
+
+    python -m fedplot.files data/*.csv
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from fedplot.store import DEFAULT_CACHE_DIR
+
+FILES_DIR = os.path.join(os.path.dirname(DEFAULT_CACHE_DIR), 'files')
+
+# Date format of the first column of each bundled file
+DATE_FORMATS = {
+    'CIVPART.csv': '%Y-%m-%d',
+    'LNS13023570.csv': '%Y-%m-%d',
+    'LNU03023558.csv': '%Y-%m-%d',
+    'LNU04000012.csv': '%Y-%m-%d',
+    'OUTMS.csv': '%Y-%m-%d',
+    'alfredgraph.csv': '%Y-%m-%d',
+    'fed_funds.csv': '%m/%d/%y',
+    'fomc_meedtings.csv': '%b-%y',
+    'foreign-native.csv': '%Y',
+    'gscpi.csv': '%d-%b-%Y',
+}
+
+_lock = threading.Lock()
+
+
+def _cache_dir(path):
+    path = os.path.abspath(path)
+    digest = hashlib.sha1(path.encode()).hexdigest()[:12]
+    return os.path.join(os.getenv('FEDPLOT_FILES_DIR', FILES_DIR), f"{os.path.basename(path)}-{digest}")
+
+
+def _file_hash(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def parse_csv(path, date_format=None):
+    """
+    Parses a CSV whose first column is a date into a float DataFrame indexed by date.
+
+    Column names are stripped of surrounding spaces (fomc_meedtings.csv has
+    ``Date, RateMove, RateTarget``). Files not listed in DATE_FORMATS fall back to
+    pandas' date inference.
+    """
+    date_format = date_format or DATE_FORMATS.get(os.path.basename(path))
+    df = pd.read_csv(path, skipinitialspace=True, dtype=str)
+    df.columns = [c.strip() for c in df.columns]
+
+    dates = df.iloc[:, 0].str.strip()
+    index = pd.to_datetime(dates, format=date_format) if date_format else pd.to_datetime(dates)
+    values = df.iloc[:, 1:].apply(lambda column: pd.to_numeric(column.str.strip(), errors='coerce'))
+    values.index = pd.DatetimeIndex(index, name=df.columns[0])
+    return values.astype('float64')
+
+
+def ingest(path, date_format=None):
+    """Parses a CSV and writes its columnar cache. Returns the cache directory."""
+    stat = os.stat(path)
+    df = parse_csv(path, date_format)
+
+    cache = _cache_dir(path)
+    os.makedirs(cache, exist_ok=True)
+    np.save(os.path.join(cache, 'index.npy'), df.index.values.astype('datetime64[ns]'))
+    np.save(os.path.join(cache, 'values.npy'), np.ascontiguousarray(df.to_numpy()))
+    _write_meta(cache, {
+        'source': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha1': _file_hash(path),
+        'index_name': df.index.name,
+        'columns': list(df.columns),
+    })
+    return cache
+
+
+def _write_meta(cache, meta):
+    path = os.path.join(cache, 'meta.json')
+    with open(path + '.tmp', 'w') as f:
+        json.dump(meta, f)
+    os.replace(path + '.tmp', path)
+
+
+def _read_meta(cache):
+    path = os.path.join(cache, 'meta.json')
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _up_to_date(path, cache, meta):
+    if meta is None:
+        return False
+    stat = os.stat(path)
+    if stat.st_size == meta['size'] and stat.st_mtime_ns == meta['mtime_ns']:
+        return True
+    if stat.st_size == meta['size'] and _file_hash(path) == meta['sha1']:
+        # Touched but not changed: remember the new mtime so the hash is not computed again
+        meta['mtime_ns'] = stat.st_mtime_ns
+        _write_meta(cache, meta)
+        return True
+    return False
+
+
+def load_file(path):
+    """
+    Returns the CSV at ``path`` as a float DataFrame indexed by date, backed by
+    memory-mapped arrays. The file is (re)ingested first if it changed.
+    """
+    cache = _cache_dir(path)
+    with _lock:
+        meta = _read_meta(cache)
+        if not _up_to_date(path, cache, meta):
+            ingest(path)
+            meta = _read_meta(cache)
+
+    index = np.load(os.path.join(cache, 'index.npy'), mmap_mode='r')
+    values = np.load(os.path.join(cache, 'values.npy'), mmap_mode='r')
+    return pd.DataFrame(values, index=pd.DatetimeIndex(index, name=meta['index_name']), columns=meta['columns'], copy=False)
+
+
+if __name__ == '__main__':
+    for csv_path in sys.argv[1:] or sorted(os.path.join('data', name) for name in DATE_FORMATS):
+        print(f"{csv_path} -> {ingest(csv_path)}")
@@ -0,0 +1,140 @@
+"""
+Mixed-frequency alignment.
+
+``load_panel`` joins series on exact dates, so quarterly GDP next to monthly
+UNRATE keeps one row in three, and daily fed funds next to monthly data keeps
+almost nothing. Here each series' native frequency is detected from its own
+observations and the whole panel is resampled to one target frequency in a
+single grouped pass per aggregation:
+
+- ``last`` - last observation of each period (levels such as rates)
+- ``first`` - first observation of each period
+- ``mean`` - average of the period (e.g. daily fed funds -> monthly average)
+- ``sum`` - total of the period (flows)
+- ``interpolate`` - last observation, with the periods between observations of a
+  coarser series filled by linear interpolation in time
+
+A series coarser than the target is carried forward until its next period
+(quarterly GDP fills the three months of its quarter) unless it is interpolated.
+``series_periods`` reports each column's periods per year as it sits in a panel,
+which ``apply_transforms`` accepts in place of a single ``periods_in_year``.
+"""
+import numpy as np
+import pandas as pd
+
+from fedplot.transforms import periods_per_year
+
+AGGREGATIONS = ('last', 'first', 'mean', 'sum', 'interpolate')
+
+# Resampling rule for a number of periods per year, from the coarsest up
+_RULES = ((1, 'YS'), (4, 'QS'), (12, 'MS'), (52, 'W'), (250, 'B'), (365, 'D'))
+
+
+def rule_for(periods):
+    """Resampling rule of the finest standard frequency not finer than ``periods`` a year, e.g. 4 -> 'QS'."""
+    rule = _RULES[0][1]
+    for threshold, name in _RULES:
+        if threshold <= periods:
+            rule = name
+    return rule
+
+
+def rule_periods(rule):
+    """Periods per year of a resampling rule, e.g. 'MS' -> 12."""
+    return periods_per_year(pd.date_range('2001-01-01', periods=8, freq=rule))
+
+
+def series_periods(panel, columns=None):
+    """
+    Periods per year of every value column, from the dates where that column has
+    an observation (so a quarterly series in an outer-joined monthly panel gives 4).
+    """
+    columns = [c for c in panel.columns if c != 'Date'] if columns is None else list(columns)
+    dates = pd.DatetimeIndex(panel['Date'])
+    observed = panel[columns].notna().to_numpy()
+    return {column: periods_per_year(dates[observed[:, idx]]) for idx, column in enumerate(columns)}
+
+
+def transform_periods(panel, freq, periods_in_year=None):
+    """
+    Periods per year the transforms of a panel use. On a common frequency (``freq``
+    set) every series brings its own, from series_periods, and ``periods_in_year``
+    is ignored; otherwise ``periods_in_year`` is used as given.
+    """
+    return series_periods(panel) if freq is not None else periods_in_year
+
+
+def _hows(how, columns):
+    hows = {column: how for column in columns} if isinstance(how, str) else {column: how.get(column, 'last') for column in columns}
+    unknown = set(hows.values()) - set(AGGREGATIONS)
+    if unknown:
+        raise ValueError(f"Unknown aggregation '{unknown.pop()}'. Use one of {', '.join(AGGREGATIONS)}.")
+    return hows
+
+
+def resample_frame(frame, rule, how='last', native=None):
+    """
+    Resamples a date-indexed frame to ``rule``, aggregating each column with
+    ``how`` (one aggregation, or a dictionary of them by column; 'last' for
+    columns not listed).
+
+    ``native`` maps columns to their periods per year (default is detected), used
+    to carry coarser columns forward to their next period only.
+    """
+    columns = list(frame.columns)
+    hows = _hows(how, columns)
+    if native is None:
+        observed = frame.notna().to_numpy()
+        native = {column: periods_per_year(frame.index[observed[:, idx]]) for idx, column in enumerate(columns)}
+    target = rule_periods(rule)
+
+    # One grouped pass per aggregation, each over all of its columns at once
+    bins = frame.resample(rule)
+    parts = []
+    for name in dict.fromkeys(hows.values()):
+        group = [column for column in columns if hows[column] == name]
+        if name == 'sum':
+            parts.append(bins[group].sum(min_count=1))
+        elif name == 'interpolate':
+            parts.append(bins[group].last())
+        else:
+            parts.append(getattr(bins[group], name)())
+    result = pd.concat(parts, axis=1)[columns]
+
+    # Coarser columns are carried forward over the target periods their own period spans
+    fills = {}
+    for column in columns:
+        if hows[column] == 'interpolate':
+            fills.setdefault('interpolate', []).append(column)
+        elif native[column] < target:
+            fills.setdefault(int(np.ceil(target / max(native[column], 1))) - 1, []).append(column)
+    for limit, group in fills.items():
+        if limit == 'interpolate':
+            result[group] = result[group].interpolate(method='time', limit_area='inside')
+        elif limit > 0:
+            result[group] = result[group].ffill(limit=limit)
+    return result
+
+
+def resample_panel(panel, freq='auto', how='last', join='inner'):
+    """
+    Puts every series of a panel on one frequency.
+
+    Parameters:
+    - panel: DataFrame with a 'Date' column and one column per series, typically outer-joined so no observation is lost
+    - freq: pandas resampling rule such as 'MS', 'QS' or 'YS'; 'auto' picks the coarsest native frequency (default)
+    - how: Aggregation for every series, or a dictionary of them by column (default 'last'); see AGGREGATIONS
+    - join: 'inner' keeps only periods where every series has a value, 'outer' every period any series has (default 'inner')
+
+    Returns a new panel with a 'Date' column of period labels.
+    """
+    columns = [c for c in panel.columns if c != 'Date']
+    frame = panel.set_index(pd.DatetimeIndex(panel['Date']))[columns].sort_index()
+    frame = frame[~frame.index.duplicated(keep='last')]
+    native = series_periods(panel, columns)
+    if freq == 'auto':
+        freq = rule_for(min(native.values(), default=1))
+
+    result = resample_frame(frame, freq, how, native).dropna(how='any' if join == 'inner' else 'all')
+    result.index.name = 'Date'
+    return result.reset_index()
@@ -0,0 +1,88 @@
+"""
+Vega-Lite specs for the interactive chart mode of the Streamlit pages.
+
+In this mode the browser draws the chart. The aligned, transformed series go out
+once as a compact table (``payload``), which ``st.vega_lite_chart`` sends as
+Arrow, and everything cosmetic lives in the spec (``chart_spec``): title, labels,
+legend text and position, marker and the visible date range. Changing those only
+changes the spec, and zooming and panning happen in the browser.
+
+The series are folded into long form by a Vega-Lite transform on the client, so
+the payload stays one column per series instead of one row per observation.
+"""
+import json
+
+import pandas as pd
+
+from fedplot.render import value_columns
+
+# Observations from this date are sent to the browser, so the From Date only sets the initial view
+HISTORY_START = '1950-01-01'
+
+LEGEND_ORIENT = {'upper right': 'top-right', 'upper left': 'top-left', 'lower right': 'bottom-right', 'lower left': 'bottom-left'}
+
+# Matplotlib marker codes and the closest Vega-Lite point shape
+MARKER_SHAPES = {'o': 'circle', '.': 'circle', 's': 'square', 'D': 'diamond', 'd': 'diamond', '^': 'triangle-up',
+                 'v': 'triangle-down', '<': 'triangle-left', '>': 'triangle-right', 'x': 'cross', '+': 'cross'}
+
+
+def payload(panel):
+    """The 'Date' column and every value column as float32, the table sent to the browser."""
+    columns = value_columns(panel)
+    data = panel[['Date'] + columns].copy()
+    data[columns] = data[columns].astype('float32')
+    return data
+
+
+def _legend_labels(columns, legend_text_generator):
+    # Vega expression mapping each column name to its legend text
+    expr = 'datum.label'
+    for column, text in reversed(list(zip(columns, legend_text_generator))):
+        expr = f'datum.label === {json.dumps(column)} ? {json.dumps(text)} : {expr}'
+    return expr
+
+
+def chart_spec(columns, kind='line', title='', legend_text_generator=(), x_label='Date', y_label='Series Value',
+               legend_loc='upper right', custom_text='', marker='o', line_width=10, from_date=None):
+    """
+    Vega-Lite spec drawing ``columns`` of a ``payload`` table against 'Date'.
+
+    Parameters:
+    - columns: Value columns of the payload, in legend order
+    - kind: 'line' for plot_series, 'vlines' for plot_series_with_vlines
+    - marker: Matplotlib marker code of the points on the lines ('' for none)
+    - line_width: Width of the vertical lines in pixels
+    - from_date: First date of the initial view; earlier data is reached by panning
+    """
+    if kind == 'vlines':
+        mark = {'type': 'rule', 'strokeWidth': line_width, 'opacity': 0.6, 'clip': True}
+    else:
+        mark = {'type': 'line', 'strokeWidth': 2, 'clip': True}
+        if marker:
+            mark['point'] = {'shape': MARKER_SHAPES.get(marker, 'circle'), 'filled': True}
+
+    x = {'field': 'Date', 'type': 'temporal', 'title': x_label}
+    if from_date is not None:
+        from_date = pd.Timestamp(from_date)
+        x['scale'] = {'domainMin': {'year': from_date.year, 'month': from_date.month, 'date': from_date.day}}
+
+    encoding = {
+        'x': x,
+        'y': {'field': 'Value', 'type': 'quantitative', 'title': y_label},
+        'color': {'field': 'Series', 'type': 'nominal', 'sort': list(columns),
+                  'legend': {'title': None, 'orient': LEGEND_ORIENT.get(legend_loc, 'top-right'),
+                             'labelExpr': _legend_labels(columns, legend_text_generator)}},
+        'tooltip': [{'field': 'Date', 'type': 'temporal'}, {'field': 'Value', 'type': 'quantitative', 'format': '.3f'}],
+    }
+    if kind == 'vlines':
+        encoding['y2'] = {'datum': 0}
+
+    return {
+        'title': {'text': title, 'subtitle': custom_text, 'fontSize': 18},
+        'height': 500,
+        'transform': [{'fold': list(columns), 'as': ['Series', 'Value']}],
+        'mark': mark,
+        'encoding': encoding,
+        # Drag to pan and scroll to zoom the dates, without a round trip to the server
+        'params': [{'name': 'zoom', 'select': {'type': 'interval', 'encodings': ['x']}, 'bind': 'scales'}],
+    }
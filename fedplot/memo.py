@@ -0,0 +1,120 @@
+"""
+Bounded in-process LRU caches with hit and miss counters.
+
+Each stage of a plot memoizes in one of these: the series store (fetch), load_panel
+(alignment), apply_transforms (transform) and render_chart (render). The caches
+live at module level, so every Streamlit session served by the process shares
+them, and each is guarded by its own lock. ``cache_stats`` reports them all for
+the pages' debug sidebar.
+"""
+import threading
+import weakref
+from collections import OrderedDict
+
+_registry = weakref.WeakValueDictionary()
+_registry_lock = threading.Lock()
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by a number of entries and, optionally, by the
+    total size of its values as measured by ``sizeof``.
+    """
+
+    def __init__(self, name, max_entries=128, max_bytes=None, sizeof=len):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = self.misses = self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry[name] = self
+
+    def get(self, key, default=None, valid=None):
+        """
+        Returns the value cached for ``key``, or ``default``. A value for which
+        ``valid(value)`` is false is kept but counted and returned as a miss.
+        """
+        with self._lock:
+            value = self._entries.get(key, default)
+            if key in self._entries and (valid is None or valid(value)):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+            return default
+
+    def peek(self, key, default=None):
+        """Returns the value cached for ``key`` without counting a lookup or refreshing its position."""
+        with self._lock:
+            return self._entries.get(key, default)
+
+    def put(self, key, value):
+        with self._lock:
+            if key in self._entries:
+                self._forget(key)
+            self._entries[key] = value
+            if self.max_bytes is not None:
+                self._bytes += self.sizeof(value)
+            # The newest entry is kept even when it alone is over max_bytes
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or
+                                              (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                self._forget(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _forget(self, key):
+        value = self._entries.pop(key)
+        if self.max_bytes is not None:
+            self._bytes -= self.sizeof(value)
+
+    def discard(self, match):
+        """Drops every entry whose key satisfies ``match(key)``."""
+        with self._lock:
+            for key in [key for key in self._entries if match(key)]:
+                self._forget(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'cache': self.name,
+                'entries': len(self._entries),
+                'bytes': self._bytes if self.max_bytes is not None else None,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else None,
+                'evictions': self.evictions,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+
+def caches():
+    """Every live cache, by name (a newer cache replaces an older one of the same name)."""
+    with _registry_lock:
+        return dict(_registry)
+
+
+def cache_stats():
+    """Counters of every live cache, one dictionary per cache."""
+    return [cache.stats() for cache in caches().values()]
+
+
+def clear_all():
+    """Empties every live cache and resets its counters."""
+    for cache in caches().values():
+        cache.clear()
+        cache.reset_stats()
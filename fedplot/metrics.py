@@ -0,0 +1,159 @@
+"""
+Timing spans and counters for every stage of a plot.
+
+The series store, ``load_panel``, ``apply_transforms`` and ``render_chart`` each
+record a span (stage, series, seconds, rows) for every call, and the store counts
+the downloads and bytes it fetches, so a slow page can be traced to FRED, BLS,
+pandas or matplotlib. Spans are kept in a bounded ring shared by every session
+of the process, and ``quantiles`` summarises them into p50/p95 latencies per
+stage or per series for the Diagnostics page.
+
+``prometheus()`` renders the spans, counters and the hit/miss counters of every
+cache (fedplot.memo) in the Prometheus text format, and ``json_lines()`` dumps
+the spans one JSON object per line. With ``FEDPLOT_METRICS_LOG`` set, every span
+is also appended to that file as it is recorded, so latencies survive restarts.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from fedplot.memo import cache_stats
+
+MAX_SPANS = 20_000
+STAGES = ('fetch', 'download', 'merge', 'transform', 'render')
+
+_spans = deque(maxlen=MAX_SPANS)
+_counters = {}
+_lock = threading.Lock()
+
+
+def _log(record):
+    path = os.getenv('FEDPLOT_METRICS_LOG')
+    if path:
+        with open(path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+
+def record(stage, seconds, series=None, rows=None):
+    """Records one finished span."""
+    entry = {'time': time.time(), 'stage': stage, 'series': series, 'seconds': seconds, 'rows': rows}
+    with _lock:
+        _spans.append(entry)
+    if rows:
+        count('rows_processed', rows, stage=stage)
+    _log(entry)
+
+
+@contextmanager
+def span(stage, series=None):
+    """
+    Times the block as one span of ``stage``. The yielded dictionary takes the
+    number of ``rows`` the block processed.
+
+        with span('merge', 'UNRATE,JTSJOR') as s:
+            panel = align(frames)
+            s['rows'] = len(panel)
+    """
+    info = {'rows': None}
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        record(stage, time.perf_counter() - start, series, info['rows'])
+
+
+def count(name, value=1, **labels):
+    """Adds ``value`` to the counter ``name`` with the given labels."""
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def counters():
+    """Every counter as a list of dictionaries with name, labels and value."""
+    with _lock:
+        return [{'name': name, 'labels': dict(labels), 'value': value} for (name, labels), value in sorted(_counters.items())]
+
+
+def spans(since=None, stage=None):
+    """The recorded spans as a DataFrame, optionally only those after ``since`` (epoch seconds) or of one stage."""
+    with _lock:
+        rows = list(_spans)
+    frame = pd.DataFrame(rows, columns=['time', 'stage', 'series', 'seconds', 'rows'])
+    if since is not None:
+        frame = frame[frame['time'] >= since]
+    if stage is not None:
+        frame = frame[frame['stage'] == stage]
+    frame['time'] = pd.to_datetime(frame['time'], unit='s')
+    frame['rows'] = frame['rows'].astype('float64')
+    return frame.reset_index(drop=True)
+
+
+def quantiles(by='stage', frame=None):
+    """
+    p50 and p95 latency, span count and total rows, grouped by 'stage' or by
+    ['stage', 'series'].
+    """
+    frame = spans() if frame is None else frame
+    if frame.empty:
+        return pd.DataFrame(columns=([by] if isinstance(by, str) else list(by)) + ['p50', 'p95', 'count', 'rows'])
+    grouped = frame.groupby(by, dropna=False)
+    summary = grouped['seconds'].quantile([0.5, 0.95]).unstack()
+    summary.columns = ['p50', 'p95']
+    summary['count'] = grouped.size()
+    summary['rows'] = grouped['rows'].sum(min_count=1)
+    return summary.reset_index()
+
+
+def reset():
+    """Drops every span and counter."""
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    escape = lambda value: str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{key}="{escape(value)}"' for key, value in labels.items()) + '}'
+
+
+def prometheus():
+    """Spans, counters and cache statistics in the Prometheus text exposition format."""
+    lines = ['# HELP fedplot_stage_seconds Latency of each plot stage.', '# TYPE fedplot_stage_seconds summary']
+    frame = spans()
+    for stage, group in frame.groupby('stage'):
+        seconds = group['seconds'].to_numpy()
+        for q in (0.5, 0.95):
+            lines.append(f'fedplot_stage_seconds{_labels({"stage": stage, "quantile": q})} {np.quantile(seconds, q):.6f}')
+        lines.append(f'fedplot_stage_seconds_sum{_labels({"stage": stage})} {seconds.sum():.6f}')
+        lines.append(f'fedplot_stage_seconds_count{_labels({"stage": stage})} {len(seconds)}')
+
+    names = []
+    for counter in counters():
+        if counter['name'] not in names:
+            names.append(counter['name'])
+            lines.append(f"# TYPE fedplot_{counter['name']}_total counter")
+        lines.append(f"fedplot_{counter['name']}_total{_labels(counter['labels'])} {counter['value']}")
+
+    stats = cache_stats()
+    for field in ('hits', 'misses', 'evictions'):
+        lines.append(f'# TYPE fedplot_cache_{field}_total counter')
+        lines.extend(f"fedplot_cache_{field}_total{_labels({'cache': s['cache']})} {s[field]}" for s in stats)
+    lines.append('# TYPE fedplot_cache_entries gauge')
+    lines.extend(f"fedplot_cache_entries{_labels({'cache': s['cache']})} {s['entries']}" for s in stats)
+    return '\n'.join(lines) + '\n'
+
+
+def json_lines():
+    """Every recorded span, one JSON object per line."""
+    with _lock:
+        rows = list(_spans)
+    return ''.join(json.dumps(row) + '\n' for row in rows)
@@ -0,0 +1,174 @@
+"""
+Summary of Economic Projections (SEP) tables.
+
+The SEP CSVs in data/ come in two wide layouts: one column per horizon and
+statistic with central tendencies as strings such as ``1.9-2.1``
+(fed_projections_sept2024.csv), or separate columns for the actuals, medians and
+the bounds of the central tendency and range
+(gdp_unemployment_projections_sept2024.csv). ``parse_sep`` reads either layout into
+one long-form table with a row per (variable, horizon, statistic) and numeric
+``value``, ``low`` and ``high`` columns. Each file is parsed once per version, so
+a new release only needs its CSV dropped into data/ with the month and year in
+its name (``..._dec2024.csv``).
+
+Statistics: ``actual`` and ``median`` set ``value``; ``central_tendency`` and
+``range`` set ``low`` and ``high``. The horizon is a year, or ``Longer run``.
+"""
+import glob
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from fedplot.memo import LRUCache
+
+SEP_GLOB = 'data/*projections*.csv'
+LONGER_RUN = 'Longer run'
+
+# FRED series and transform chain matching each SEP variable (Q4/Q4 growth for GDP and inflation)
+SEP_SERIES = {
+    'Change in real GDP': ('GDPC1', ('yoy',)),
+    'Unemployment rate': ('UNRATE', ()),
+    'PCE inflation': ('PCEPI', ('yoy',)),
+    'Core PCE inflation': ('PCEPILFE', ('yoy',)),
+    'Federal funds rate': ('FEDFUNDS', ()),
+}
+
+# Column statistic -> (statistic, field it fills)
+_STATISTICS = {
+    'actual': ('actual', 'value'),
+    'median': ('median', 'value'),
+    'central_tendency': ('central_tendency', 'range'),
+    'upper_end_of_central_tendency': ('central_tendency', 'high'),
+    'lower_end_of_central_tendency': ('central_tendency', 'low'),
+    'upper_end_of_range': ('range', 'high'),
+    'lower_end_of_range': ('range', 'low'),
+}
+
+_MONTHS = {'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6, 'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12}
+
+_COLUMN = re.compile(r'^(?P<horizon>\d{4}|Longer_run)_(?P<statistic>.+)$')
+_RANGE = re.compile(r'(-?\d+(?:\.\d+)?)(?:\s*-\s*(-?\d+(?:\.\d+)?))?')
+
+_cache = LRUCache('projections', max_entries=32)
+
+
+def release_of(path):
+    """Release month of an SEP file from its name, e.g. '..._sept2024.csv' -> Period('2024-09')."""
+    match = re.search(r'([a-z]+)(\d{4})$', os.path.splitext(os.path.basename(path))[0].lower())
+    if match is None or match.group(1)[:3] not in _MONTHS:
+        raise ValueError(f"Cannot tell the release of '{path}'. Name it like 'projections_sept2024.csv' or pass release=.")
+    return pd.Period(year=int(match.group(2)), month=_MONTHS[match.group(1)[:3]], freq='M')
+
+
+def _split_range(text):
+    # '1.9-2.1' -> (1.9, 2.1) and '2.0' -> (2.0, 2.0); a minus sign may precede either bound
+    match = _RANGE.fullmatch(text.strip())
+    if match is None:
+        raise ValueError(f"Cannot read '{text}' as a range.")
+    low, high = match.groups()
+    return float(low), float(high if high is not None else low)
+
+
+def parse_sep(path, release=None):
+    """
+    Parses one SEP CSV into a long-form DataFrame with columns release, variable,
+    horizon, statistic, value, low and high.
+    """
+    release = pd.Period(release, freq='M') if release is not None else release_of(path)
+    wide = pd.read_csv(path, dtype=str, skipinitialspace=True)
+
+    records = {}
+    for column in wide.columns[1:]:
+        match = _COLUMN.match(column.strip())
+        if match is None or match.group('statistic').lower() not in _STATISTICS:
+            raise ValueError(f"Unknown SEP column '{column}' in {path}.")
+        horizon = LONGER_RUN if match.group('horizon') == 'Longer_run' else match.group('horizon')
+        statistic, field = _STATISTICS[match.group('statistic').lower()]
+
+        for variable, text in zip(wide.iloc[:, 0].str.strip(), wide[column]):
+            if pd.isna(text) or not text.strip():
+                continue
+            record = records.setdefault((variable, horizon, statistic), {'value': np.nan, 'low': np.nan, 'high': np.nan})
+            if field == 'range':
+                record['low'], record['high'] = _split_range(text)
+            else:
+                record[field] = float(text)
+
+    table = pd.DataFrame([{'release': release, 'variable': v, 'horizon': h, 'statistic': s, **fields}
+                          for (v, h, s), fields in records.items()])
+    return table.astype({'value': 'float64', 'low': 'float64', 'high': 'float64'})
+
+
+def _parsed(path):
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    table = _cache.get(key)
+    if table is None:
+        table = parse_sep(path)
+        _cache.put(key, table)
+    return table
+
+
+def load_projections(paths=None):
+    """
+    Every SEP release found in ``paths`` (default data/*projections*.csv) as one
+    table indexed by (release, variable, horizon, statistic). When two files of a
+    release give the same figure, the first one wins.
+    """
+    paths = sorted(glob.glob(SEP_GLOB)) if paths is None else paths
+    table = pd.concat([_parsed(path) for path in paths], ignore_index=True)
+    table = table.groupby(['release', 'variable', 'horizon', 'statistic'], sort=True).first()
+    return table
+
+
+def releases(table):
+    return sorted(table.index.get_level_values('release').unique())
+
+
+def _release(table, release):
+    # The latest release by default; '2024-09' or a Timestamp names the month of one
+    return releases(table)[-1] if release is None else pd.Period(release, freq='M')
+
+
+def variables(table, release=None):
+    release = _release(table, release)
+    return list(table.xs(release, level='release').index.get_level_values('variable').unique())
+
+
+def fan(table, variable, release=None):
+    """
+    The projections of one variable as one row per year horizon with columns
+    median, central_low, central_high, range_low and range_high, and the
+    longer-run row (or None) as a Series of the same fields.
+    """
+    release = _release(table, release)
+    rows = table.xs((release, variable), level=('release', 'variable'))
+
+    fields = pd.DataFrame({
+        'median': rows['value'].xs('median', level='statistic'),
+    })
+    for statistic, prefix in (('central_tendency', 'central'), ('range', 'range')):
+        if statistic in rows.index.get_level_values('statistic'):
+            bounds = rows.xs(statistic, level='statistic')
+            fields[f'{prefix}_low'] = bounds['low']
+            fields[f'{prefix}_high'] = bounds['high']
+        else:
+            fields[f'{prefix}_low'] = fields[f'{prefix}_high'] = np.nan
+
+    longer_run = fields.loc[LONGER_RUN] if LONGER_RUN in fields.index else None
+    years = fields.drop(index=LONGER_RUN, errors='ignore')
+    years.index = years.index.astype(int)
+    return years.sort_index(), longer_run
+
+
+def actuals(table, variable, release=None):
+    """Actual values of a variable published with a release, indexed by year (empty if none)."""
+    release = _release(table, release)
+    rows = table.xs((release, variable), level=('release', 'variable'))
+    if 'actual' not in rows.index.get_level_values('statistic'):
+        return pd.Series(dtype='float64')
+    values = rows['value'].xs('actual', level='statistic')
+    values.index = values.index.astype(int)
+    return values.sort_index()
@@ -0,0 +1,352 @@
+"""
+Figure rendering without pyplot.
+
+Every chart is drawn on its own ``matplotlib.figure.Figure`` attached to an Agg
+canvas, so no figure is ever registered with pyplot's global state and each one
+is released as soon as its PNG/SVG bytes are written. The bytes are cached on a
+hash of the plotted data plus the plot parameters, so an identical request is
+served without drawing anything.
+"""
+import hashlib
+import io
+import threading
+
+import numpy as np
+import pandas as pd
+
+from fedplot import metrics
+from fedplot.decimate import pixel_width, thin
+from fedplot.memo import LRUCache
+
+FIGSIZE = (12, 8)
+CACHE_BYTES = 64 * 1024 * 1024
+
+_style = None
+_draw_lock = threading.Lock()
+_cache = LRUCache('render', max_entries=1024, max_bytes=CACHE_BYTES)
+
+
+def _theme():
+    # seaborn's whitegrid style with the dark palette, computed once instead of sns.set() per render
+    global _style
+    if _style is None:
+        import seaborn as sns
+        from cycler import cycler
+
+        _style = dict(sns.axes_style('whitegrid'))
+        _style.update(sns.plotting_context('notebook'))
+        _style['axes.prop_cycle'] = cycler('color', sns.color_palette('dark'))
+    return _style
+
+
+def _new_figure():
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=FIGSIZE)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+
+def _decorate(ax, title, x_label, y_label, x_rotation=0):
+    # Enhance the title and labels
+    ax.set_title(title, fontsize=18, weight='bold', color='#333333')
+    ax.set_xlabel(x_label, fontsize=14, weight='bold', color='#333333')
+    ax.set_ylabel(y_label, fontsize=14, weight='bold', color='#333333')
+
+    # Rotate the x-axis labels for better readability and adjust their size
+    ax.tick_params(axis='x', labelrotation=x_rotation, labelsize=12)
+    ax.tick_params(axis='y', labelsize=12)
+
+    # Add a grid with more customization
+    ax.grid(True, linestyle='--', linewidth=0.6, alpha=0.7)
+
+
+def value_columns(panel):
+    return [c for c in panel.columns if c not in ('Date', 'Year')]
+
+
+def _label(legend_text_generator, idx, column):
+    return legend_text_generator[idx] if idx < len(legend_text_generator) else column
+
+
+def _footer(fig, sources, custom_text):
+    # Add a footer with the source of the data
+    if 'FRED' in sources and 'BLS' in sources:
+        fig.text(0.27, 0, 'Source: Federal Reserve Economic Data and U.S. Bureau of Labor Statistics', ha="center", fontsize=12, style='italic')
+    elif 'FRED' in sources:
+        fig.text(0.17, 0, 'Source: Federal Reserve Economic Data', ha="center", fontsize=12, style='italic')
+    elif 'BLS' in sources:
+        fig.text(0.17, 0, 'Source: U.S. Bureau of Labor Statistics', ha="center", fontsize=12, style='italic')
+    else:
+        fig.text(0.17, 0, custom_text, ha="center", fontsize=12, style='italic')
+
+
+def draw_line(panel, title, legend_text_generator, x_label='Date', y_label='Series Value', legend_loc='upper right',
+              custom_text='Source: Federal Reserve Economic Data', marker='o', plot_type=None, sources=(), decimate=True):
+    """
+    Line plot of every value column of ``panel`` against its 'Date' column.
+
+    The footer names FRED and/or BLS when they are among ``sources`` and shows
+    ``custom_text`` otherwise. With ``decimate``, a series with more points than
+    the axes are pixels wide is reduced with LTTB first (see fedplot.decimate).
+    """
+    import seaborn as sns
+
+    plot_type = plot_type or sns.lineplot
+    fig, ax = _new_figure()
+
+    # Plot each series, with at most one point per pixel
+    max_points = pixel_width(ax) if decimate else len(panel)
+    for idx, column in enumerate(value_columns(panel)):
+        plot_type(x='Date', y=column, data=thin(panel, column, max_points), ax=ax,
+                  label=_label(legend_text_generator, idx, column), linewidth=2, marker=marker)
+
+    _decorate(ax, title, x_label, y_label)
+
+    # Show the legend with a custom location and background
+    ax.legend(loc=legend_loc, frameon=True, fontsize=12, fancybox=True, shadow=True)
+
+    _footer(fig, sources, custom_text)
+
+    # Tighten layout to make the plot look cleaner
+    fig.tight_layout()
+    return fig
+
+
+def draw_vlines(panel, title, legend_text_generator, x_label='Date', y_label='Series Value', legend_loc='upper right',
+                line_width=10, sources=(), decimate=True):
+    """
+    Vertical lines from each observation to zero, so the series reads like a bar plot.
+
+    With ``decimate``, only the lowest and highest observation of each pixel
+    column of the axes is drawn, which leaves the outline of the bars unchanged.
+    """
+    from matplotlib.lines import Line2D
+
+    fig, ax = _new_figure()
+
+    # Add vertical lines from each data point to the x-axis (y=0)
+    max_points = 2 * pixel_width(ax) if decimate else len(panel)
+    for column in value_columns(panel):
+        bars = thin(panel, column, max_points, method='minmax')
+        ax.vlines(bars['Date'], ymin=0, ymax=bars[column], color='blue', alpha=0.6, linewidth=line_width)
+
+    _decorate(ax, title, x_label, y_label)
+
+    # Show the legend with a custom location and background
+    custom_legend = [Line2D([0], [0], color='blue', lw=1, label=legend_text_generator[0])]
+    ax.legend(handles=custom_legend, loc=legend_loc, fontsize=12, fancybox=True, shadow=True)
+
+    _footer(fig, sources, 'Source: U.S. Bureau of Labor Statistics')
+
+    # Tighten layout to make the plot look cleaner
+    fig.tight_layout()
+    return fig
+
+
+def _bucket_label(start, width, last_year):
+    end = start + width - 1
+    if width == 1 and end <= last_year:
+        return f'{start}'
+    return f'{start} - {end if end <= last_year else "Present"}'
+
+
+def draw_scatter(panel, title, x_label='Unemployment Rate', y_label='Vacancy Rate', year_cutoff=2022,
+                 legend_loc='upper right', custom_text='Source: Federal Reserve Economic Data', add_line=False,
+                 bucket_years=2, legend_text_generator=None):
+    """
+    Scatter of the first value column against the second, colored in buckets of
+    ``bucket_years`` years from ``year_cutoff``; earlier points are gray.
+
+    Further pairs of value columns (third against fourth, ...) are drawn with other
+    markers and named in the legend by ``legend_text_generator``. With ``add_line``
+    consecutive points from ``year_cutoff`` on are joined into a trajectory.
+    """
+    import seaborn as sns
+    from matplotlib.collections import LineCollection
+    from matplotlib.colors import to_rgba
+    from matplotlib.lines import Line2D
+
+    columns = value_columns(panel)
+    pairs = [(columns[i], columns[i + 1]) for i in range(0, len(columns) - 1, 2)]
+    fig, ax = _new_figure()
+
+    # Every point's color bucket from its year, in one pass: -1 before the cutoff, then 0, 1, ... per bucket_years
+    years = pd.DatetimeIndex(panel['Date']).year.to_numpy()
+    after = years >= year_cutoff
+    first_year = years[after].min() if after.any() else year_cutoff
+    buckets = np.where(after, (years - first_year) // bucket_years, -1)
+    n_buckets = int(buckets.max()) + 1 if after.any() else 0
+
+    palette = np.array([to_rgba(c) for c in sns.color_palette('dark', max(n_buckets, 1))])
+    colors = np.where(after[:, None], palette[np.maximum(buckets, 0) % len(palette)], to_rgba('gray', 0.6))
+
+    markers = ['o', 's', '^', 'D', 'v', 'P']
+    for idx, (x_column, y_column) in enumerate(pairs):
+        x, y = panel[x_column].to_numpy(dtype='float64'), panel[y_column].to_numpy(dtype='float64')
+        # All points of the pair in a single PathCollection
+        ax.scatter(x, y, c=colors, marker=markers[idx % len(markers)])
+
+        if add_line:
+            # One segment per pair of consecutive points from the cutoff on, colored by its later point
+            points = np.column_stack((x, y))
+            keep = after[1:] & after[:-1]
+            segments = np.stack((points[:-1], points[1:]), axis=1)[keep]
+            ax.add_collection(LineCollection(segments, colors=colors[1:][keep], linewidths=2))
+
+    # Legend: one entry per color bucket, plus one per marker when there are several pairs
+    handles = []
+    if (~after).any():
+        handles.append(Line2D([], [], linestyle='', marker='o', color='gray', alpha=0.6, label=f'Before {year_cutoff}'))
+    last_year = int(years.max()) if len(years) else year_cutoff
+    for bucket in range(n_buckets):
+        start = int(first_year) + bucket * bucket_years
+        handles.append(Line2D([], [], linestyle='', marker='o', color=palette[bucket % len(palette)],
+                              label=_bucket_label(start, bucket_years, last_year)))
+    if len(pairs) > 1:
+        for idx, (x_column, y_column) in enumerate(pairs):
+            label = legend_text_generator[idx] if legend_text_generator and idx < len(legend_text_generator) else f'{x_column} vs {y_column}'
+            handles.append(Line2D([], [], linestyle='', marker=markers[idx % len(markers)], color='#333333', label=label))
+
+    _decorate(ax, title, x_label, y_label)
+
+    # Add a legend
+    ax.legend(handles=handles, loc=legend_loc, frameon=True, fontsize=12, fancybox=True, shadow=True)
+
+    # Add a footer with source information
+    fig.text(0.2, 0.02, custom_text, ha="center", fontsize=12, style='italic')
+    return fig
+
+
+def draw_bars(panel, title, legend_text_generator=(), x_label='Date', y_label='Percent', legend_loc='lower right',
+              date_format='%Y-%m', custom_text='Source: Federal Reserve Economic Data'):
+    """One group of bars per row of ``panel``, labelled with its 'Date' formatted by ``date_format``."""
+    columns = value_columns(panel)
+    fig, ax = _new_figure()
+
+    # Bars of the same date sit side by side, like sns.barplot with a hue
+    positions = np.arange(len(panel))
+    width = 0.8 / len(columns)
+    for idx, column in enumerate(columns):
+        ax.bar(positions + (idx - (len(columns) - 1) / 2) * width, panel[column].to_numpy(), width=width,
+               label=_label(legend_text_generator, idx, column))
+
+    # Label every date when they fit, otherwise about 24 of them
+    step = max(1, len(panel) // 24)
+    ax.set_xticks(positions[::step])
+    ax.set_xticklabels(pd.DatetimeIndex(panel['Date']).strftime(date_format)[::step])
+    ax.axhline(0, color='#333333', linewidth=0.8)
+
+    _decorate(ax, title, x_label, y_label, x_rotation=45)
+
+    # Show the legend with a custom location and background
+    ax.legend(loc=legend_loc, frameon=True, fontsize=12, fancybox=True, shadow=True)
+
+    fig.text(0.17, 0, custom_text, ha="center", fontsize=12, style='italic')
+
+    # Tighten layout to make the plot look cleaner
+    fig.tight_layout()
+    return fig
+
+
+def draw_fan(panel, title, fan, longer_run=None, legend_text_generator=(), x_label='Date', y_label='Percent',
+             legend_loc='upper left', custom_text='Source: Federal Reserve Summary of Economic Projections'):
+    """
+    FOMC projections of one variable drawn as a fan after its history.
+
+    ``panel`` holds the history (a 'Date' column and one value column, possibly
+    none). ``fan`` is a tuple of (year, median, central_low, central_high,
+    range_low, range_high) rows, plotted at the end of each year, and
+    ``longer_run`` is the same fields without the year, or None. The range is
+    shaded lightly, the central tendency darker, and the median drawn on top.
+    """
+    fig, ax = _new_figure()
+
+    for idx, column in enumerate(value_columns(panel)):
+        ax.plot(panel['Date'], panel[column], color='#333333', linewidth=2,
+                label=_label(legend_text_generator, idx, column))
+
+    rows = np.array([row[1:] for row in fan], dtype='float64').reshape(-1, 5)
+    dates = pd.to_datetime([f'{row[0]}-12-31' for row in fan])
+    median, central_low, central_high, range_low, range_high = rows.T
+    color = _theme()['axes.prop_cycle'].by_key()['color'][0]
+    if not np.isnan(range_low).all():
+        ax.fill_between(dates, range_low, range_high, color=color, alpha=0.15, linewidth=0, label='Range')
+    if not np.isnan(central_low).all():
+        ax.fill_between(dates, central_low, central_high, color=color, alpha=0.35, linewidth=0, label='Central tendency')
+    ax.plot(dates, median, color=color, linewidth=2, marker='o', label='Median projection')
+
+    # The longer run has no date, so it sits one year past the last projection
+    if longer_run is not None and len(dates):
+        lr_median, lr_low, lr_high = longer_run[0], longer_run[1], longer_run[2]
+        lr_date = dates[-1] + pd.DateOffset(years=1)
+        errors = None if np.isnan([lr_low, lr_high]).any() else [[lr_median - lr_low], [lr_high - lr_median]]
+        ax.errorbar([lr_date], [lr_median], yerr=errors, color=color, marker='D', markersize=8, capsize=6,
+                    linestyle='none', label='Longer run')
+
+    _decorate(ax, title, x_label, y_label)
+
+    # Show the legend with a custom location and background
+    ax.legend(loc=legend_loc, frameon=True, fontsize=12, fancybox=True, shadow=True)
+
+    fig.text(0.17, 0, custom_text, ha="center", fontsize=12, style='italic')
+
+    # Tighten layout to make the plot look cleaner
+    fig.tight_layout()
+    return fig
+
+
+DRAWERS = {'line': draw_line, 'vlines': draw_vlines, 'scatter': draw_scatter, 'bars': draw_bars, 'fan': draw_fan}
+
+
+def chart_key(kind, panel, fmt, params):
+    """Hash of the plotted data plus everything that changes how it is drawn."""
+    h = hashlib.sha1()
+    h.update(f'{kind}|{fmt}|{list(panel.columns)}'.encode())
+    h.update(pd.util.hash_pandas_object(panel, index=False).values.tobytes())
+    for name in sorted(params):
+        value = params[name]
+        value = getattr(value, '__qualname__', value)
+        h.update(f'|{name}={value!r}'.encode())
+    return h.hexdigest()
+
+
+def figure_bytes(fig, fmt='png', dpi=100):
+    """Writes a figure to PNG/SVG bytes and releases it."""
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight')
+    finally:
+        fig.clear()
+    return buffer.getvalue()
+
+
+def render_chart(kind, panel, fmt='png', **params):
+    """
+    Returns the chart as PNG or SVG bytes, drawing it only if the same data and
+    parameters were not rendered before.
+
+    Parameters:
+    - kind: 'line', 'vlines', 'scatter', 'bars' or 'fan'
+    - panel: DataFrame with a 'Date' column and one column per series
+    - fmt: 'png', 'svg', or 'json' for the panel itself as split-oriented JSON (default 'png')
+    - params: Keyword arguments of the matching draw_* function
+    """
+    import matplotlib
+
+    with metrics.span('render', f'{kind}:{fmt}') as span:
+        span['rows'] = len(panel)
+        key = chart_key(kind, panel, fmt, params)
+        data = _cache.get(key)
+        if data is None:
+            if fmt == 'json':
+                # The data behind the chart, e.g. for clients that draw it themselves; nothing is drawn
+                data = panel.to_json(orient='split', index=False, date_format='iso').encode()
+            else:
+                # rcParams are process-global, so figures are styled and drawn one at a time
+                with _draw_lock, matplotlib.rc_context(_theme()):
+                    fig = DRAWERS[kind](panel, **params)
+                    data = figure_bytes(fig, fmt)
+            _cache.put(key, data)
+    return data
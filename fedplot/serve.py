@@ -0,0 +1,239 @@
+"""
+Local HTTP service that renders charts without Streamlit.
+
+``POST /chart`` takes a chart spec entry, ``{"function": "plot_series", "kwargs":
+{...}}`` with the same kwargs as in charts.json and main.ipynb (``function``
+defaults to ``plot_series``), and returns the chart as PNG, SVG or the plotted
+data as JSON, chosen with ``?format=png|svg|json``. ``GET /health`` returns the
+hit/miss counters of every cache and ``GET /metrics`` the stage latencies and
+counters in the Prometheus text format (see fedplot.metrics).
+
+Identical requests that arrive while one is being rendered wait for that one
+instead of fetching and rendering again, and at most ``workers`` charts are
+built at the same time. Their fetches, alignment and transforms run in parallel,
+but drawing is serialised by render_chart's lock (matplotlib's rcParams are
+process-global), so only one chart is drawn at a time. Every response carries an ETag (a hash of its bytes), so
+a client sending it back in If-None-Match gets a bodyless 304 when the chart has
+not changed.
+
+FILE sources are refused unless the server is started with ``--data-dir``, and
+then only CSVs inside that directory are read, so a client cannot make the
+server open arbitrary files.
+
+    python -m fedplot.serve --port 8050 --workers 4
+    python -m fedplot.serve --offline    # synthetic FRED/BLS series, no network
+    python -m fedplot.serve --data-dir data    # FILE sources such as foreign-native.csv
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from fedplot.charts import CHARTS
+from fedplot import metrics
+from fedplot.fetch import FetchErrors
+from fedplot.memo import cache_stats
+from fedplot.sources import offline_sources
+from fedplot.store import SeriesStore, get_store
+
+CONTENT_TYPES = {'png': 'image/png', 'svg': 'image/svg+xml', 'json': 'application/json'}
+MAX_BODY = 1024 * 1024
+
+
+class BadRequest(ValueError):
+    """A chart request that can never succeed, answered with 400."""
+
+
+class ChartService:
+    """
+    Builds charts from spec entries in a bounded thread pool, coalescing identical
+    requests that are in flight at the same time.
+
+    Parameters:
+    - store: SeriesStore used for FRED/BLS fetches (default is the shared store)
+    - workers: Number of charts built at the same time (default 4)
+    - data_dir: Directory FILE sources are read from, relative to it (default None refuses FILE sources)
+
+    ``coalesced`` counts the requests that were served by a build already running.
+    """
+
+    def __init__(self, store=None, workers=4, data_dir=None):
+        self.store = store or get_store()
+        self.data_dir = os.path.realpath(data_dir) if data_dir else None
+        self.coalesced = 0
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='chart')
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _build(self, function, kwargs, fmt):
+        data = CHARTS[function](**kwargs, fmt=fmt, store=self.store)
+        return data, hashlib.sha1(data).hexdigest()
+
+    def _resolve_files(self, series_dict):
+        # FILE paths are resolved inside data_dir; anything outside it, absolute or via '..', is refused
+        if not isinstance(series_dict, dict):
+            raise BadRequest('series_dict must be a JSON object of series IDs and sources.')
+        resolved = {}
+        for series_id, source in series_dict.items():
+            if source == 'FILE':
+                if self.data_dir is None:
+                    raise BadRequest('FILE sources are not served; start the server with --data-dir to allow CSVs from one directory.')
+                path = os.path.realpath(os.path.join(self.data_dir, series_id))
+                if os.path.commonpath([path, self.data_dir]) != self.data_dir:
+                    raise BadRequest(f"FILE source '{series_id}' is outside the server's data directory.")
+                series_id = path
+            resolved[series_id] = source
+        return resolved
+
+    def chart(self, spec, fmt='png'):
+        """
+        Returns ``(data, etag)`` for a spec entry, building it at most once however
+        many identical requests arrive while it is being built.
+        """
+        if not isinstance(spec, dict) or not isinstance(spec.get('kwargs', {}), dict):
+            raise BadRequest('The request body must be a JSON object {"function": ..., "kwargs": {...}}.')
+        function = spec.get('function', 'plot_series')
+        if function not in CHARTS:
+            raise BadRequest(f"Unknown function '{function}'. Use one of {', '.join(CHARTS)}.")
+        if fmt not in CONTENT_TYPES:
+            raise BadRequest(f"Unknown format '{fmt}'. Use one of {', '.join(CONTENT_TYPES)}.")
+        kwargs = spec.get('kwargs', {})
+        try:
+            inspect.signature(CHARTS[function]).bind(**kwargs)
+        except TypeError as e:
+            raise BadRequest(f'{function}: {e}') from e
+        if 'fmt' in kwargs or 'store' in kwargs:
+            raise BadRequest("Pass the format as ?format= rather than in kwargs; the store is the server's.")
+        if 'plot_type' in kwargs:
+            # A seaborn plotting function in Python; JSON can only name it
+            raise BadRequest("plot_type cannot be set over HTTP; charts are drawn with seaborn's lineplot.")
+        if 'series_dict' in kwargs:
+            kwargs = dict(kwargs, series_dict=self._resolve_files(kwargs['series_dict']))
+
+        key = json.dumps([function, kwargs, fmt], sort_keys=True)
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._pool.submit(self._build, function, kwargs, fmt)
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+        if leader:
+            # Outside the lock: a build that already finished runs the callback right here
+            future.add_done_callback(lambda _: self._forget(key))
+        return future.result()
+
+    def _forget(self, key):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+
+class ChartHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def _send(self, status, body=b'', content_type='application/json', etag=None):
+        self.send_response(status)
+        if etag is not None:
+            self.send_header('ETag', f'"{etag}"')
+        if status != 304:
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({'error': message}).encode())
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/metrics':
+            self._send(200, metrics.prometheus().encode(), 'text/plain; version=0.0.4')
+            return
+        if path != '/health':
+            self._error(404, 'Unknown endpoint. Use POST /chart, GET /health or GET /metrics.')
+            return
+        body = {'caches': cache_stats(), 'inflight': len(self.service._inflight), 'coalesced': self.service.coalesced}
+        self._send(200, json.dumps(body).encode())
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/chart':
+            self._error(404, 'Unknown endpoint. Use POST /chart, GET /health or GET /metrics.')
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY:
+            self._error(413, f'Chart specs are limited to {MAX_BODY} bytes.')
+            return
+        fmt = parse_qs(url.query).get('format', ['png'])[0]
+
+        try:
+            data, etag = self.service.chart(json.loads(self.rfile.read(length) or b'{}'), fmt)
+        except (BadRequest, json.JSONDecodeError) as e:
+            self._error(400, str(e))
+            return
+        except FetchErrors as e:
+            self._error(502, str(e))
+            return
+        except Exception as e:
+            self._error(500, f'{type(e).__name__}: {e}')
+            return
+
+        # If-None-Match may list several tags, possibly weak ones
+        tags = {tag.strip().removeprefix('W/').strip('"') for tag in self.headers.get('If-None-Match', '').split(',')}
+        if etag in tags or '*' in tags:
+            self._send(304, etag=etag)
+        else:
+            self._send(200, data, CONTENT_TYPES[fmt], etag)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port=0, host='127.0.0.1', store=None, workers=4, data_dir=None):
+    """
+    Starts the chart service on a background thread and returns ``(server, url)``.
+    ``server.RequestHandlerClass.service`` is the ChartService behind it.
+    """
+    handler = type('Handler', (ChartHandler,), {'service': ChartService(store, workers, data_dir)})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve charts over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--workers', type=int, default=4, help='charts built at the same time (default 4)')
+    parser.add_argument('--offline', action='store_true', help='serve synthetic FRED/BLS series instead of calling the APIs')
+    parser.add_argument('--data-dir', help='directory FILE sources may be read from (default: FILE sources are refused)')
+    args = parser.parse_args(argv)
+
+    store = None
+    if args.offline:
+        # A throwaway cache, so synthetic series never end up in the real one
+        store = SeriesStore(offline_sources(), cache_dir=tempfile.mkdtemp(prefix='fedplot-offline-'))
+
+    server, url = start_server(args.port, args.host, store, args.workers, args.data_dir)
+    print(f'Serving charts at {url}/chart')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        server.RequestHandlerClass.service.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,130 @@
+"""
+Fetchers for the series sources used by the plots.
+
+Every fetcher exposes ``fetch(series_id, start=None)`` and returns a pandas Series
+indexed by observation date (a DatetimeIndex), which is the shape the plotting
+code expects. ``start`` asks for observations on or after that date only; a
+fetcher may return a little more (BLS works in whole years), never less.
+"""
+import datetime
+import os
+import threading
+import zlib
+
+import numpy as np
+import pandas as pd
+
+
+class FredSource:
+    """
+    Fetches series from the FRED API. The ``fredapi`` client is only built on the
+    first fetch so that importing this module never needs an API key.
+
+    ``root_url`` points the client at another server, e.g. the fake API used by the
+    benchmarks.
+    """
+    name = 'FRED'
+
+    def __init__(self, api_key=None, root_url=None):
+        self.api_key = api_key
+        self.root_url = root_url
+        self._client = None
+        self._lock = threading.Lock()
+
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                from fredapi import Fred
+                self._client = Fred(api_key=self.api_key or os.getenv('FRED_API_KEY'))
+                if self.root_url:
+                    self._client.root_url = self.root_url
+            return self._client
+
+    def fetch(self, series_id, start=None):
+        return self.client().get_series(series_id, observation_start=start)
+
+
+class BlsSource:
+    """
+    Fetches series from the BLS API and converts the period index to timestamps so
+    the result looks like a FRED series.
+
+    Without BLS_API_KEY the API serves at most ten years per request, starting at
+    ``startyear``; an older ``start`` is then ignored so the latest ten years are
+    returned as before.
+    """
+    name = 'BLS'
+
+    def _startyear(self, start):
+        if start is not None and (os.getenv('BLS_API_KEY') or start.year > datetime.date.today().year - 10):
+            return start.year
+        return None
+
+    def available_start(self, start=None):
+        """
+        Earliest date a fetch from ``start`` can return: without BLS_API_KEY and
+        without a usable ``startyear``, only the latest ten years.
+        """
+        if self._startyear(start) is None and not os.getenv('BLS_API_KEY'):
+            return pd.Timestamp(year=datetime.date.today().year - 9, month=1, day=1)
+        return start
+
+    def fetch(self, series_id, start=None):
+        from bls import get_series
+
+        startyear = self._startyear(start)
+        unformatted_data = get_series(series_id, startyear=startyear)
+        x = unformatted_data.index.to_timestamp()
+        y = unformatted_data.values
+        return pd.Series(y, index=x)
+
+
+class FakeSource:
+    """
+    In-memory stand-in for a FRED or BLS fetcher, used to run the pages and the
+    series store offline.
+
+    Parameters:
+    - series: Dictionary mapping series IDs to pandas Series
+    - name: Source name reported by the fetcher (default is 'FAKE')
+    - generate: Function returning the series for an ID not in ``series``, e.g. synthetic_series (default None raises for unknown IDs)
+
+    Every call is recorded in ``calls`` as ``(series_id, start)`` so callers can
+    check how often, and for how much history, the network would have been hit.
+    """
+
+    def __init__(self, series=None, name='FAKE', generate=None):
+        self.series = dict(series or {})
+        self.name = name
+        self.generate = generate
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def fetch(self, series_id, start=None):
+        with self._lock:
+            self.calls.append((series_id, start))
+            if series_id not in self.series and self.generate is not None:
+                self.series[series_id] = self.generate(series_id)
+        if series_id not in self.series:
+            raise ValueError(f"Unknown series {series_id}")
+        series = self.series[series_id]
+        if start is not None:
+            series = series[series.index >= start]
+        return series.copy()
+
+
+def synthetic_series(series_id, periods=600, start='1975-01-01', freq='MS'):
+    """Deterministic monthly random walk for a series ID, so repeated fetches agree."""
+    rng = np.random.default_rng(zlib.crc32(series_id.encode()))
+    index = pd.date_range(start, periods=periods, freq=freq)
+    return pd.Series(rng.normal(size=periods).cumsum() + 100, index=index)
+
+
+def offline_sources():
+    """FRED and BLS stand-ins serving a synthetic series for any ID, to run without network or API keys."""
+    return {'FRED': FakeSource(name='FRED', generate=synthetic_series), 'BLS': FakeSource(name='BLS', generate=synthetic_series)}
+
+
+def default_sources():
+    """Returns the fetchers used by the pages, keyed by source name."""
+    return {'FRED': FredSource(), 'BLS': BlsSource()}
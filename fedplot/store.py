@@ -0,0 +1,236 @@
+"""
+Persistent series cache shared by every page.
+
+Fetched series are kept as Parquet files on local disk, one file per
+(source, series_id), with a small JSON sidecar holding the fetch metadata. An
+in-process LRU sits on top so that repeat plots in the same server process do not
+even touch the disk. Once a cached series goes stale only the observations after
+its last date (plus a short revision window) are downloaded and merged in.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import quote
+
+import pandas as pd
+
+from fedplot import metrics
+from fedplot.memo import LRUCache
+from fedplot.sources import default_sources
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'series')
+DEFAULT_TTL = 6 * 60 * 60
+DEFAULT_REVISION_DAYS = 180
+
+
+def _checksum(series):
+    return hashlib.sha1(pd.util.hash_pandas_object(series, index=True).values.tobytes()).hexdigest()
+
+
+def _revised_dates(old, new):
+    # Dates present in both downloads whose value changed between vintages
+    common = old.index.intersection(new.index)
+    old_values, new_values = old.loc[common], new.loc[common]
+    changed = (old_values != new_values) & ~(old_values.isna() & new_values.isna())
+    return [d.strftime('%Y-%m-%d') for d in common[changed.values]]
+
+
+class SeriesStore:
+    """
+    Caches fetched series on disk and in memory, keyed by (source, series_id).
+
+    Parameters:
+    - sources: Dictionary mapping a source name ('FRED', 'BLS') to a fetcher with a ``fetch(series_id)`` method
+    - cache_dir: Directory for the Parquet files (default is ``.cache/series`` in the repo, or $FEDPLOT_CACHE_DIR)
+    - ttl: Seconds before a cached series is fetched again (default is 6 hours, or $FEDPLOT_CACHE_TTL)
+    - max_entries: Number of series kept in the in-process LRU (default is 64)
+    - incremental: Update stale series with a delta request instead of the full history (default True)
+    - revision_days: How far before the last cached observation a delta request starts, so recent revisions are picked up (default is 180, or $FEDPLOT_REVISION_DAYS)
+
+    Each entry records the vintage (the realtime date the values were valid for) and
+    a checksum, so that a re-fetch after the TTL expires can report which
+    observations were revised.
+    """
+
+    def __init__(self, sources=None, cache_dir=None, ttl=None, max_entries=64, incremental=True, revision_days=None):
+        self.sources = sources if sources is not None else default_sources()
+        self.cache_dir = cache_dir or os.getenv('FEDPLOT_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.ttl = float(ttl if ttl is not None else os.getenv('FEDPLOT_CACHE_TTL', DEFAULT_TTL))
+        self.max_entries = max_entries
+        self.incremental = incremental
+        self.revision_days = int(revision_days if revision_days is not None else os.getenv('FEDPLOT_REVISION_DAYS', DEFAULT_REVISION_DAYS))
+        self._memory = LRUCache('series', max_entries=max_entries)
+
+    def _paths(self, source, series_id):
+        base = os.path.join(self.cache_dir, source, quote(series_id, safe=''))
+        return base + '.parquet', base + '.json'
+
+    def _remember(self, key, series, meta):
+        self._memory.put(key, (series, meta))
+
+    def _is_fresh(self, meta):
+        return time.time() - meta['fetched_at'] < self.ttl
+
+    def _read_disk(self, source, series_id):
+        data_path, meta_path = self._paths(source, series_id)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None, None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        df = pd.read_parquet(data_path)
+        series = pd.Series(df['value'].values, index=pd.DatetimeIndex(df['date']))
+        return series, meta
+
+    def _write_disk(self, source, series_id, series, meta):
+        data_path, meta_path = self._paths(source, series_id)
+        directory = os.path.dirname(data_path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Write to uniquely named temporary files first, so a concurrent reader never sees half a file and
+        # concurrent writers never share one. The metadata is swapped in last: after a crash in between, the
+        # new data sits under its old fetch date and start, and is simply fetched again.
+        temps = []
+        try:
+            for path in (data_path, meta_path):
+                with tempfile.NamedTemporaryFile(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp', delete=False) as f:
+                    temps.append(f.name)
+            df = pd.DataFrame({'date': series.index, 'value': series.values.astype('float64')})
+            df.to_parquet(temps[0], index=False)
+            with open(temps[1], 'w') as f:
+                json.dump(meta, f)
+            os.replace(temps[0], data_path)
+            os.replace(temps[1], meta_path)
+        finally:
+            for temp in temps:
+                if os.path.exists(temp):
+                    os.remove(temp)
+
+    def _covers(self, meta, start):
+        # Whether the cached history reaches back far enough for a request starting at ``start``. A source that
+        # returned less than was asked for (BLS without a key) would do the same again, so the request counts too.
+        if meta.get('start') is None or (start is not None and start >= pd.Timestamp(meta['start'])):
+            return True
+        requested = meta.get('requested_start', meta.get('start'))
+        return meta.get('start_limited', False) and (requested is None or (start is not None and start >= pd.Timestamp(requested)))
+
+    def _fetch(self, source, series_id, start=None, previous=None, previous_meta=None):
+        if source not in self.sources:
+            raise ValueError(f"Invalid source '{source}' for series {series_id}. Use 'FRED' or 'BLS'.")
+
+        # With a usable cached copy only the newest observations plus a revision window are requested
+        delta = self.incremental and previous is not None and len(previous) > 0 and self._covers(previous_meta, start)
+        if delta:
+            request_start = previous.index[-1] - pd.Timedelta(days=self.revision_days)
+            history_start = previous_meta.get('start')
+            requested_start = previous_meta.get('requested_start', history_start)
+            limited = previous_meta.get('start_limited', False)
+        else:
+            request_start = start
+            requested_start = None if start is None else start.strftime('%Y-%m-%d')
+            # Record what the source can actually return, e.g. only the latest ten years of BLS without a key
+            available = getattr(self.sources[source], 'available_start', lambda s: s)(start)
+            limited = available is not None and (start is None or available > start)
+            history_start = requested_start if not limited else available.strftime('%Y-%m-%d')
+
+        with metrics.span('download', f'{source}:{series_id}') as span:
+            data = self.sources[source].fetch(series_id, start=request_start)
+            span['rows'] = len(data)
+        # fredapi and bls do not expose response sizes, so this is the size of what they returned
+        metrics.count('downloads', source=source)
+        metrics.count('bytes_downloaded', int(data.memory_usage(index=True)), source=source)
+        fetched = pd.Series(pd.to_numeric(data.values, errors='coerce'), index=pd.DatetimeIndex(data.index))
+        fetched = fetched[~fetched.index.duplicated(keep='last')].sort_index()
+        if delta:
+            # Keep the cached history before the window and take everything from the window on
+            series = pd.concat([previous[previous.index < request_start], fetched[fetched.index >= request_start]])
+        else:
+            series = fetched
+
+        now = time.time()
+        meta = {
+            'source': source,
+            'series_id': series_id,
+            'fetched_at': now,
+            'vintage': time.strftime('%Y-%m-%d', time.gmtime(now)),
+            'start': history_start,
+            'requested_start': requested_start,
+            'start_limited': limited,
+            'last_date': series.index[-1].strftime('%Y-%m-%d') if len(series) else None,
+            'delta_from': request_start.strftime('%Y-%m-%d') if delta else None,
+            'rows_fetched': int(len(fetched)),
+            'rows': int(len(series)),
+            'checksum': _checksum(series),
+            'revised_dates': [],
+        }
+        if previous is not None:
+            meta['previous_vintage'] = previous_meta['vintage']
+            if previous_meta['checksum'] != meta['checksum']:
+                meta['revised_dates'] = _revised_dates(previous, series)
+
+        self._write_disk(source, series_id, series, meta)
+        return series, meta
+
+    def get(self, source, series_id, refresh=False, start=None):
+        """
+        Returns the series for (source, series_id), fetching it only when it is not
+        cached, the cached copy is older than the TTL, or it does not reach back to
+        ``start``.
+
+        ``start`` is pushed down into the request, so a series first plotted from
+        2015 only downloads observations from 2015 on. A stale copy is updated by
+        requesting the observations after its last date (less the revision window)
+        rather than the full history.
+        """
+        key = (source, series_id)
+        start = None if start is None else pd.Timestamp(start)
+
+        with metrics.span('fetch', f'{source}:{series_id}') as span:
+            cached = self._memory.get(key, valid=lambda c: not refresh and self._is_fresh(c[1]) and self._covers(c[1], start))
+            if cached is not None:
+                series = cached[0]
+            else:
+                series, meta = self._read_disk(source, series_id)
+                if series is None or refresh or not self._is_fresh(meta) or not self._covers(meta, start):
+                    series, meta = self._fetch(source, series_id, start, series, meta)
+                self._remember(key, series, meta)
+
+            series = series[series.index >= start] if start is not None else series.copy()
+            span['rows'] = len(series)
+        return series
+
+    def info(self, source, series_id):
+        """Returns the metadata recorded for a cached series, or None if it was never fetched."""
+        cached = self._memory.peek((source, series_id))
+        if cached is not None:
+            return dict(cached[1])
+        return self._read_disk(source, series_id)[1]
+
+    def invalidate(self, source=None, series_id=None):
+        """Drops cached series from memory and disk. With no arguments the whole cache is cleared."""
+        self._memory.discard(lambda k: (source is None or k[0] == source) and (series_id is None or k[1] == series_id))
+
+        if source is not None and series_id is not None:
+            paths = self._paths(source, series_id)
+        else:
+            paths = []
+            for root, _, files in os.walk(self.cache_dir if source is None else os.path.join(self.cache_dir, source)):
+                paths.extend(os.path.join(root, name) for name in files)
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_store():
+    """Returns the process-wide store used by the pages."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = SeriesStore()
+        return _default_store
@@ -0,0 +1,211 @@
+"""
+Vectorized transforms over an aligned panel.
+
+The pages used to loop over ``Value_{idx}`` columns and apply ``diff`` or
+``pct_change`` one column at a time, guessing periods-per-year from the median
+gap between dates. Here every transform works on the whole 2-D NumPy block at
+once, transforms can be chained, year-over-year changes look up the observation
+one calendar year earlier (so irregular daily data such as fed_funds.csv works),
+and results are memoized per (series set, transform chain).
+
+A chain is a sequence of step names applied left to right:
+
+- ``diff`` - change from the previous observation
+- ``pct`` - percent change from the previous observation
+- ``yoy`` - percent change from one year earlier
+- ``annualized`` - percent change from the previous observation, compounded to an annual rate
+- ``logdiff`` - 100 x change in the natural log
+- ``rolling:N`` - mean of the last N observations
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from fedplot import metrics
+from fedplot.memo import LRUCache
+
+# Periods per year for the base frequencies pandas can infer
+_FREQ_PERIODS = {
+    'A': 1, 'Y': 1, 'AS': 1, 'YS': 1, 'YE': 1, 'BA': 1, 'BY': 1, 'BYS': 1, 'BYE': 1,
+    'Q': 4, 'QS': 4, 'QE': 4, 'BQ': 4, 'BQS': 4, 'BQE': 4,
+    'M': 12, 'MS': 12, 'ME': 12, 'BM': 12, 'BMS': 12, 'BME': 12, 'SM': 24, 'SMS': 24, 'SME': 24,
+    'W': 52, 'B': 261, 'C': 261, 'D': 365, 'H': 8760, 'h': 8760,
+}
+
+STEPS = ('diff', 'pct', 'yoy', 'annualized', 'logdiff', 'rolling')
+
+_CACHE_SIZE = 128
+_cache = LRUCache('transform', max_entries=_CACHE_SIZE)
+
+
+def _inferred_periods(dates):
+    # Periods per year of the frequency pandas infers, or None for irregular dates
+    freq = pd.infer_freq(dates) if len(dates) >= 3 else None
+    if freq is None:
+        return None
+    base = freq.split('-')[0]
+    multiple = ''.join(ch for ch in base if ch.isdigit())
+    base = base.lstrip('0123456789')
+    if base not in _FREQ_PERIODS:
+        return None
+    return max(1, round(_FREQ_PERIODS[base] / int(multiple or 1)))
+
+
+def periods_per_year(dates):
+    """
+    Returns how many observations a year ``dates`` holds.
+
+    Uses the frequency pandas infers from the dates (monthly -> 12, quarterly -> 4,
+    business daily -> 261, ...). Irregular dates, such as business days with
+    holidays missing, fall back to the average number of observations per year over
+    the whole span rather than the median gap between two observations.
+    """
+    dates = pd.DatetimeIndex(dates)
+    if len(dates) < 2:
+        return 1
+
+    periods = _inferred_periods(dates)
+    if periods is not None:
+        return periods
+
+    span_years = (dates[-1] - dates[0]) / pd.Timedelta(days=365.25)
+    return max(1, round((len(dates) - 1) / span_years))
+
+
+def transform_chain(change_in=False, percent_change=False, year_over_year=False):
+    """Builds the chain for the pages' 'Show Change', 'Percent Change' and 'Year Over Year' checkboxes."""
+    chain = []
+    if change_in:
+        chain.append('pct' if percent_change else 'diff')
+    if year_over_year:
+        chain.append('yoy')
+    return tuple(chain)
+
+
+def _previous(values):
+    previous = np.empty_like(values)
+    previous[0] = np.nan
+    previous[1:] = values[:-1]
+    return previous
+
+
+def _year_ago_positions(dates, periods_in_year):
+    # Row holding the observation one year before each row, or -1 if there is none
+    n = len(dates)
+    if periods_in_year is not None:
+        positions = np.arange(n) - int(periods_in_year)
+    else:
+        target = (dates - pd.DateOffset(years=1)).values
+        positions = np.searchsorted(dates.values, target, side='right') - 1
+    positions[positions < 0] = -1
+    return positions
+
+
+def _lagged(values, positions):
+    lagged = values[np.clip(positions, 0, None)]
+    lagged[positions < 0] = np.nan
+    return lagged
+
+
+def _observed_lag(values, periods):
+    # Each column compared with its own observation ``periods`` observations earlier, skipping gaps
+    lagged = np.full_like(values, np.nan)
+    for idx, lag in enumerate(periods):
+        rows = np.flatnonzero(~np.isnan(values[:, idx]))
+        if lag < len(rows):
+            lagged[rows[lag:], idx] = values[rows[:len(rows) - lag], idx]
+    return lagged
+
+
+def _apply_per_series(name, values, periods):
+    # 'yoy' and 'annualized' with a periods-per-year value for every column
+    periods = np.asarray(periods, dtype='int64')
+    if name == 'yoy':
+        return (values / _observed_lag(values, periods) - 1) * 100
+    return ((values / _observed_lag(values, np.ones_like(periods))) ** periods - 1) * 100
+
+
+def _apply_step(step, values, dates, periods_in_year):
+    name, _, arg = step.partition(':')
+    if isinstance(periods_in_year, tuple) and name in ('yoy', 'annualized'):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return _apply_per_series(name, values, periods_in_year)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if name == 'diff':
+            return values - _previous(values)
+        if name == 'pct':
+            return (values / _previous(values) - 1) * 100
+        if name == 'logdiff':
+            return np.log(values / _previous(values)) * 100
+        if name == 'yoy':
+            return (values / _lagged(values, _year_ago_positions(dates, periods_in_year)) - 1) * 100
+        if name == 'annualized':
+            # Compound each period's growth over the number of such periods in a year;
+            # irregular data uses the actual gap between observations instead
+            periods = periods_in_year or _inferred_periods(dates)
+            if periods is not None:
+                exponent = np.full(len(dates), float(periods))
+            else:
+                days = np.empty(len(dates))
+                days[0] = np.nan
+                days[1:] = np.diff(dates.values).astype('timedelta64[s]').astype(float) / 86400
+                exponent = 365.25 / days
+            return ((values / _previous(values)) ** exponent[:, None] - 1) * 100
+        if name == 'rolling':
+            window = int(arg or 3)
+            result = np.full_like(values, np.nan)
+            if len(values) >= window:
+                windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+                result[window - 1:] = windows.mean(axis=-1)
+            return result
+    raise ValueError(f"Unknown transform '{step}'. Use one of {', '.join(STEPS)}.")
+
+
+def _digest(dates, values):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(dates.values.astype('datetime64[ns]').tobytes())
+    h.update(np.ascontiguousarray(values).tobytes())
+    return h.hexdigest()
+
+
+def apply_transforms(panel, chain, periods_in_year=None, columns=None):
+    """
+    Applies a transform chain to every value column of a panel at once.
+
+    Parameters:
+    - panel: DataFrame with a 'Date' column and one column per series, as returned by load_panel
+    - chain: Sequence of steps such as ('pct', 'yoy'); see the module docstring
+    - periods_in_year: Observations per year used by 'yoy' and 'annualized' (default None looks dates up by calendar).
+      A dictionary gives every column its own value (see fedplot.frequency.series_periods); each column is then
+      compared with its own earlier observations, skipping the rows where it has none
+    - columns: Value columns to transform (default is every column except 'Date')
+
+    Returns a new DataFrame; the input panel is left unchanged.
+    """
+    chain = tuple(chain)
+    if not chain:
+        return panel.copy()
+
+    columns = [c for c in panel.columns if c != 'Date'] if columns is None else list(columns)
+    if isinstance(periods_in_year, dict):
+        missing = [c for c in columns if c not in periods_in_year]
+        if missing:
+            raise ValueError(f"No periods in year given for column '{missing[0]}'.")
+        periods_in_year = tuple(int(periods_in_year[c]) for c in columns)
+    dates = pd.DatetimeIndex(panel['Date'])
+    values = panel[columns].to_numpy(dtype='float64', copy=True)
+
+    with metrics.span('transform', ','.join(map(str, columns))) as span:
+        key = (tuple(columns), chain, periods_in_year, _digest(dates, values))
+        cached = _cache.get(key)
+        if cached is None:
+            for step in chain:
+                values = _apply_step(step, values, dates, periods_in_year)
+            cached = values
+            _cache.put(key, cached)
+        span['rows'] = len(values)
+
+    result = panel.copy()
+    result[columns] = cached
+    return result
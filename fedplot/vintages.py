@@ -0,0 +1,189 @@
+"""
+Revision analysis of ALFRED vintages (data/alfredgraph.csv).
+
+ALFRED exports one column per vintage (``PAYEMS_CHG_20210205``, ...), one row per
+observation date, and almost every cell repeats the one in the previous vintage.
+``VintageTable`` keeps only the runs: for each date, the vintages at which its
+value changed (first publication included) and the new value. The runs are
+stored in date order with an offset array per date, like a CSR matrix, so every
+query is a few vectorized passes over the runs rather than over dates x vintages.
+
+    table = load_vintages()
+    table.as_of('2021-06-30')     # the series as published on that day
+    table.first_vs_latest()       # first release, latest value and total revision per date
+    table.revisions()             # every revision: date, vintage, old and new value
+"""
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from fedplot.files import load_file
+from fedplot.memo import LRUCache
+
+ALFRED_PATH = 'data/alfredgraph.csv'
+
+_cache = LRUCache('vintages', max_entries=8)
+
+
+def vintage_date(column):
+    """Vintage of an ALFRED column name such as 'PAYEMS_CHG_20210205'."""
+    match = re.search(r'(\d{8})$', column)
+    if match is None:
+        raise ValueError(f"Column '{column}' does not end in a YYYYMMDD vintage date.")
+    return pd.Timestamp(match.group(1))
+
+
+class VintageTable:
+    """
+    One series across vintages, stored as runs of unchanged values.
+
+    Attributes:
+    - dates: Observation dates (n)
+    - vintages: Vintage dates, sorted (m)
+    - offsets: Runs of dates[i] are run_start[offsets[i]:offsets[i + 1]] (n + 1)
+    - run_start: Index in ``vintages`` from which each run holds
+    - run_value: Value of each run (NaN while the date is not yet published)
+    """
+
+    def __init__(self, dates, vintages, offsets, run_start, run_value, name=None):
+        self.dates = pd.DatetimeIndex(dates)
+        self.vintages = pd.DatetimeIndex(vintages)
+        self.offsets = offsets
+        self.run_start = run_start
+        self.run_value = run_value
+        self.name = name
+
+    @classmethod
+    def from_wide(cls, frame, name=None):
+        """Builds the table from a date-indexed frame with one column per vintage."""
+        vintages = pd.DatetimeIndex([vintage_date(c) for c in frame.columns])
+        order = np.argsort(vintages.values, kind='stable')
+        values = frame.to_numpy(dtype='float64')[:, order]
+
+        # A run starts in the first vintage and wherever the value differs from the previous vintage
+        previous = values[:, :-1]
+        current = values[:, 1:]
+        unchanged = (current == previous) | (np.isnan(current) & np.isnan(previous))
+        starts = np.concatenate((np.ones((len(values), 1), dtype=bool), ~unchanged), axis=1)
+
+        rows, columns = np.nonzero(starts)
+        offsets = np.concatenate(([0], np.cumsum(starts.sum(axis=1))))
+        return cls(frame.index, vintages[order], offsets.astype(np.int64), columns.astype(np.int32),
+                   values[rows, columns], name=name)
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def run_count(self):
+        return len(self.run_start)
+
+    def _run_dates(self):
+        # Index into ``dates`` of every run
+        return np.repeat(np.arange(len(self.dates)), np.diff(self.offsets))
+
+    def _vintage_index(self, vintage):
+        # Last vintage published on or before ``vintage`` (-1 if none)
+        return int(np.searchsorted(self.vintages.values, np.datetime64(pd.Timestamp(vintage), 'ns'), side='right')) - 1
+
+    def as_of(self, vintage):
+        """The series as published on ``vintage``: the latest value every date had by then."""
+        index = self._vintage_index(vintage)
+        if index < 0:
+            return pd.Series(np.nan, index=self.dates, name=self.name)
+        # Runs are sorted by start within each date, so the runs already in effect are a prefix
+        in_effect = np.add.reduceat((self.run_start <= index).astype(np.int64), self.offsets[:-1])
+        return pd.Series(self.run_value[self.offsets[:-1] + in_effect - 1], index=self.dates, name=self.name)
+
+    def latest(self):
+        """Values in the newest vintage."""
+        return pd.Series(self.run_value[self.offsets[1:] - 1], index=self.dates, name=self.name)
+
+    def first_release(self):
+        """
+        DataFrame of the first published value of every date and the vintage that
+        published it (NaN/NaT for dates never published).
+        """
+        published = ~np.isnan(self.run_value)
+        positions = np.where(published, np.arange(self.run_count), self.run_count)
+        first = np.minimum.reduceat(positions, self.offsets[:-1])
+        found = first < self.run_count
+        first = np.minimum(first, self.run_count - 1)
+        return pd.DataFrame({
+            'value': np.where(found, self.run_value[first], np.nan),
+            'vintage': pd.DatetimeIndex(np.where(found, self.vintages.values[self.run_start[first]], np.datetime64('NaT'))),
+        }, index=self.dates)
+
+    def first_vs_latest(self):
+        """First release, latest value, total revision and number of revisions of every date."""
+        first = self.first_release()
+        latest = self.latest()
+        published = ~np.isnan(self.run_value)
+        # Every published run after the first one is a revision
+        releases = np.add.reduceat(published.astype(np.int64), self.offsets[:-1])
+        return pd.DataFrame({
+            'first_release': first['value'],
+            'first_vintage': first['vintage'],
+            'latest': latest,
+            'revision': latest - first['value'],
+            'revisions': np.maximum(releases - 1, 0),
+        }, index=self.dates)
+
+    def revisions(self, start=None, end=None):
+        """
+        Every revision of a published value, one row each: observation date,
+        vintage that revised it, previous and new value and the delta.
+        """
+        run_dates = self._run_dates()
+        same_date = run_dates[1:] == run_dates[:-1]
+        before, after = self.run_value[:-1], self.run_value[1:]
+        revised = same_date & ~np.isnan(before) & ~np.isnan(after)
+        positions = np.flatnonzero(revised) + 1
+
+        table = pd.DataFrame({
+            'date': self.dates[run_dates[positions]],
+            'vintage': self.vintages[self.run_start[positions]],
+            'previous': self.run_value[positions - 1],
+            'value': self.run_value[positions],
+        })
+        table['delta'] = table['value'] - table['previous']
+        if start is not None:
+            table = table[table['date'] >= pd.Timestamp(start)]
+        if end is not None:
+            table = table[table['date'] <= pd.Timestamp(end)]
+        return table.reset_index(drop=True)
+
+    def history(self, date):
+        """Value of one observation date in every vintage."""
+        i = self.dates.get_loc(pd.Timestamp(date))
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        lengths = np.diff(np.append(self.run_start[lo:hi], len(self.vintages)))
+        return pd.Series(np.repeat(self.run_value[lo:hi], lengths), index=self.vintages, name=self.name)
+
+    def to_wide(self):
+        """The dense dates x vintages frame the table was built from, columns in vintage order."""
+        # Each run covers the vintages up to the next run of its date, or to the newest vintage
+        ends = np.append(self.run_start[1:], len(self.vintages)).astype(np.int64)
+        ends[self.offsets[1:] - 1] = len(self.vintages)
+        lengths = ends - self.run_start
+
+        rows = np.repeat(self._run_dates(), lengths)
+        within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        values = np.empty((len(self.dates), len(self.vintages)))
+        values[rows, np.repeat(self.run_start, lengths) + within] = np.repeat(self.run_value, lengths)
+        return pd.DataFrame(values, index=self.dates, columns=self.vintages)
+
+
+def load_vintages(path=ALFRED_PATH):
+    """The VintageTable of an ALFRED CSV, rebuilt only when the file changes."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    table = _cache.get(key)
+    if table is None:
+        frame = load_file(path)
+        name = os.path.commonprefix([c.rsplit('_', 1)[0] for c in frame.columns]) or None
+        table = VintageTable.from_wide(frame, name=name)
+        _cache.put(key, table)
+    return table
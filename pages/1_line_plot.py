@@ -1,135 +1,86 @@
+import time
+
 import streamlit as st
 import pandas as pd
-import seaborn as sns, os
-import matplotlib.pyplot as plt
-from fredapi import Fred
-from bls import get_series
+from fedplot import metrics
+from fedplot.data import data_version, load_panel
+from fedplot.frequency import AGGREGATIONS, transform_periods
+from fedplot.interactive import HISTORY_START, chart_spec, payload
+from fedplot.memo import cache_stats
+from fedplot.render import render_chart
+from fedplot.store import get_store
+from fedplot.transforms import apply_transforms, periods_per_year, transform_chain
 
 # load APIs
 # from dotenv import load_dotenv
 # load_dotenv()
 
-# Configure FRED and BLS API keys
-API_KEY = os.getenv('FRED_API_KEY')
-# os.environ['BLS_API_KEY'] = os.getenv('BLS_API_KEY')
+# FRED and BLS series are fetched through the shared cache, which only builds the API
+# clients (reading FRED_API_KEY and BLS_API_KEY) the first time it needs the network
+store = get_store()
 
-# Initialize FRED API
-fred = Fred(api_key=API_KEY)
+# Spans recorded from here on belong to this run of the page
+run_start = time.time()
 
 # Plot line FRED or BLS data
 def plot_series(series_dict, title, legend_text_generator, from_date='2000-01-01', x_label='Date', y_label='Series Value', 
-                change_in=False, plot_type=sns.lineplot, legend_loc='upper right', percent_change=False, year_over_year=False, periods_in_year=None,
-                custom_text='Source: Federal Reserve Economic Data', marker='o'):
-    # Initialize an empty DataFrame for merging
-    merged_df = pd.DataFrame()
-
-    # Fetch each series based on its source (FRED or BLS) and merge into the DataFrame
-    for idx, (series_id, source) in enumerate(series_dict.items()):
-        if source == 'FRED':
-            try:
-                data = fred.get_series(series_id)
-            except Exception as e:
-                raise ValueError(f"Error fetching FRED series {series_id}: {e}")
-        elif source == 'BLS':
-            try:
-                unformatted_data = get_series(series_id)  # Assuming get_series fetches BLS data
-
-                # Convert the BLS data into a format similar to FRED (pandas Series with Date as index)
-                x = unformatted_data.index.to_timestamp()
-                y = unformatted_data.values
-                data = pd.Series(y, index=x)
-            except Exception as e:
-                raise ValueError(f"Error fetching BLS series {series_id}: {e}")
-        elif source == 'FILE':
-            pass
-        else:
-            raise ValueError(f"Invalid source '{source}' for series {series_id}. Use 'FRED' or 'BLS'.")
-
-        # Create DataFrame from the fetched data
-        
-        if source == 'FILE':
-            df = pd.read_csv(series_id, index_col=0, parse_dates=True)
-        else:
-            df = pd.DataFrame(data, columns=[f"Value_{idx}"])
-        df['Date'] = df.index
-        df = df[df['Date'] >= from_date]  # Filter from the specified date onwards
-
-        # Merge with the main DataFrame on 'Date'
-        if merged_df.empty:
-            merged_df = df
-        else:
-            merged_df = pd.merge(merged_df, df, on="Date", how="inner")
-
-    median_diff = merged_df['Date'].diff().median()
-    st.write("Periods in year user inputted " + str(periods_in_year))
-    periods_in_year_calc = round(pd.Timedelta('365 days') / median_diff)
-    st.write("Periods in year calculated " + str(periods_in_year_calc))
-
-    if periods_in_year is None:
-        periods_in_year = periods_in_year_calc
-
-    # If change_in is True, calculate either diff or percentage change
-    if change_in:
-        if percent_change:
-            for idx in range(len(series_dict)):
-                merged_df[f'Value_{idx}'] = merged_df[f'Value_{idx}'].pct_change() * 100
-        else:
-            for idx in range(len(series_dict)):
-                merged_df[f'Value_{idx}'] = merged_df[f'Value_{idx}'].diff()
-
-    # If year_over_year is True, calculate YoY percentage change
-    if year_over_year:
-        st.write("Periods in year " + str(periods_in_year))
-        for idx in range(len(series_dict)):
-            merged_df[f'Value_{idx}'] = merged_df[f'Value_{idx}'].pct_change(int(periods_in_year)) * 100
-
-    # Set up the style using seaborn
-    sns.set(style="whitegrid", palette="dark")
-
-    # Create a figure and axis with a larger size for better aesthetics
-    plt.figure(figsize=(12, 8))
-
-    # Plot each series
-    for idx in range(len(series_dict)):
-        plot_type(x='Date', y=f'Value_{idx}', data=merged_df, 
-                     label=legend_text_generator[idx], linewidth=2, marker=marker)
-
-    # Enhance the title and labels
-    plt.title(title, fontsize=18, weight='bold', color='#333333')
-    plt.xlabel(x_label, fontsize=14, weight='bold', color='#333333')
-    plt.ylabel(y_label, fontsize=14, weight='bold', color='#333333')
-
-    # Rotate the x-axis labels for better readability and adjust their size
-    plt.xticks(rotation=0, fontsize=12)
-    plt.yticks(fontsize=12)
-
-    # Add a grid with more customization
-    plt.grid(True, linestyle='--', linewidth=0.6, alpha=0.7)
-
-    # Show the legend with a custom location and background
-    plt.legend(loc=legend_loc, frameon=True, fontsize=12, fancybox=True, shadow=True)
-
-    # Add a footer with the source of the data
-    plt.figtext(0.17, 0, custom_text, ha="center", fontsize=12, style='italic')
-
-    # Tighten layout to make the plot look cleaner
-    plt.tight_layout()
-
-    # Display the plot
-    st.pyplot(plt)
+                change_in=False, plot_type=None, legend_loc='upper right', percent_change=False, year_over_year=False, periods_in_year=None,
+                custom_text='Source: Federal Reserve Economic Data', marker='o', freq=None, how='last'):
+    # Fetch every series (FRED, BLS or FILE) and align them on their dates, or on a common frequency
+    merged_df = load_panel(series_dict, from_date, store=store, freq=freq, how=how)
+
+    # Periods in a year come from the frequency of the dates, not the median gap between them
+    periods_in_year_calc = periods_per_year(merged_df['Date'])
+    st.caption(f"Periods in year: {periods_in_year} entered, {periods_in_year_calc} detected from the dates")
+
+    # On a common frequency every series brings its own periods per year, as in fedplot.charts
+    periods_in_year = transform_periods(merged_df, freq, periods_in_year)
+
+    # Apply the change / percent change / year over year transforms to every series at once.
+    # Without a periods_in_year override, year over year compares with the date one year earlier.
+    merged_df = apply_transforms(merged_df, transform_chain(change_in, percent_change, year_over_year), periods_in_year)
+
+    # Draw on a standalone Agg figure; an identical chart is served from the render cache
+    st.image(render_chart('line', merged_df, title=title, legend_text_generator=legend_text_generator,
+                          x_label=x_label, y_label=y_label, legend_loc=legend_loc, custom_text=custom_text,
+                          marker=marker, plot_type=plot_type))
+
+# Interactive line plot drawn by the browser
+def plot_series_interactive(series_dict, title, legend_text_generator, from_date='2000-01-01', x_label='Date', y_label='Series Value',
+                            change_in=False, legend_loc='upper right', percent_change=False, year_over_year=False, periods_in_year=None,
+                            custom_text='Source: Federal Reserve Economic Data', marker='o', freq=None, how='last'):
+    # The series are only loaded and transformed again when the series, their data version or the
+    # transforms change; every other input just changes the chart spec
+    chain = transform_chain(change_in, percent_change, year_over_year)
+    data_key = (tuple(series_dict.items()), data_version(series_dict, HISTORY_START, store), chain, periods_in_year, freq, how)
+    if st.session_state.get('line_plot_key') != data_key:
+        merged_df = load_panel(series_dict, HISTORY_START, store=store, freq=freq, how=how)
+        st.session_state['line_plot_data'] = payload(apply_transforms(merged_df, chain, transform_periods(merged_df, freq, periods_in_year)))
+        st.session_state['line_plot_key'] = data_key
+
+    data = st.session_state['line_plot_data']
+    spec = chart_spec([c for c in data.columns if c != 'Date'], 'line', title, legend_text_generator, x_label, y_label,
+                      legend_loc, custom_text, marker, from_date=from_date)
+    st.vega_lite_chart(data, spec, width='stretch')
 
 # Streamlit app
 st.title("Economic Series Plotter")
 
 # User input for series
+interactive = st.sidebar.toggle("Interactive chart", value=False,
+                                help="Draw the chart in the browser: zoom and pan with the mouse, and restyle it without reloading the data")
 st.sidebar.header("Series Input")
 num_series = st.sidebar.number_input("Number of series to plot", min_value=1, max_value=10, value=1)
 series_dict = {}
 legend_text_generator = []
 
 for i in range(num_series):
-    series_id = st.sidebar.text_input(f"Series ID {i+1}", value=f"SAMPLE_SERIES_{i+1}")
-    source = st.sidebar.selectbox(f"Source for Series {i+1}", options=["FRED", "BLS"], key=f"source_{i+1}")
+    source = st.sidebar.selectbox(f"Source for Series {i+1}", options=["FRED", "BLS", "FILE"], key=f"source_{i+1}")
+    if source == "FILE":
+        series_id = st.sidebar.text_input(f"CSV path {i+1}", value="data/foreign-native.csv",
+                                          help="CSV with a date column first and one column per series, relative to the app directory")
+    else:
+        series_id = st.sidebar.text_input(f"Series ID {i+1}", value=f"SAMPLE_SERIES_{i+1}")
     legend_text = st.sidebar.text_input(f"Legend text for Series {i+1}", value=f"Series {i+1}")
     series_dict[series_id] = source
     legend_text_generator.append(legend_text)
@@ -146,15 +97,25 @@ percent_change = st.checkbox("Show Percent Change", value=False)
 year_over_year = st.checkbox("Year Over Year Change", value=False)
 legend_loc = st.selectbox("Legend Location", options=["upper right", "upper left", "lower right", "lower left"])
 periods_in_year = st.number_input("Periods in Year", min_value=0, max_value=52, value=12)
-
-# Generate plot
-if st.button("Plot Series"):
+frequencies = {"Exact dates": None, "Coarsest series": "auto", "Monthly": "MS", "Quarterly": "QS", "Annual": "YS"}
+frequency = st.selectbox("Align Frequencies", options=list(frequencies),
+                         help="Resample mixed-frequency series (e.g. quarterly GDP and monthly UNRATE) to one frequency instead of joining on exact dates; periods in year then come from each series")
+how = st.selectbox("Aggregation", options=AGGREGATIONS, disabled=frequencies[frequency] is None,
+                   help="How each period's observations are combined: last, first, mean, sum, or last with the gaps of coarser series interpolated")
+
+# Generate plot; once plotted, an interactive chart stays up and follows the other inputs
+plot_clicked = st.button("Plot Series")
+if plot_clicked:
+    st.session_state['line_plot_shown'] = True
+
+if plot_clicked or (interactive and st.session_state.get('line_plot_shown')):
     if percent_change and year_over_year:
         st.error("Please select only one of 'Percent Change' or 'Year Over Year Change'.")
     
     if periods_in_year == 0: periods_in_year = None
 
-    plot_series(
+    plot = plot_series_interactive if interactive else plot_series
+    plot(
         series_dict=series_dict, 
         title=title, 
         legend_text_generator=legend_text_generator,
@@ -167,5 +128,15 @@ if st.button("Plot Series"):
         year_over_year=year_over_year, 
         custom_text=custom_text,
         periods_in_year=periods_in_year,
-        marker=marker
-    )
\ No newline at end of file
+        marker=marker,
+        freq=frequencies[frequency],
+        how=how
+    )
+
+# Hit/miss counters of the fetch, align, transform and render caches, shared by every session of this server
+if st.sidebar.checkbox("Show cache statistics", value=False):
+    st.sidebar.dataframe(pd.DataFrame(cache_stats()), hide_index=True)
+
+# Fetch, merge, transform and render spans of this run; the Diagnostics page has the history
+if st.sidebar.checkbox("Show stage timings", value=False):
+    st.sidebar.dataframe(metrics.spans(since=run_start)[['stage', 'series', 'seconds', 'rows']], hide_index=True)
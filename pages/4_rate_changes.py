@@ -0,0 +1,63 @@
+import streamlit as st
+import pandas as pd
+from fedplot.events import FREQUENCIES, fomc_meetings, net_moves
+from fedplot.files import load_file
+from fedplot.memo import cache_stats
+from fedplot.render import render_chart
+
+# Daily fed funds target (Rate and Change columns) and the FOMC meeting decisions, in basis points
+FED_FUNDS_PATH = 'data/fed_funds.csv'
+FOMC_PATH = 'data/fomc_meedtings.csv'
+
+# Bar labels per period (quarters are labelled by their first month)
+DATE_FORMATS = {'Weekly': '%Y-%m-%d', 'Monthly': '%Y-%m', 'Quarterly': '%Y-%m', 'Per FOMC meeting': '%b %Y'}
+
+def plot_rate_changes(start, end, frequency, title, x_label='Date', y_label='Percent', compare_meetings=False,
+                      legend_loc='lower right', custom_text='Source: Federal Reserve Economic Data'):
+    """
+    Plots the net move of the fed funds target in every period between start and end.
+
+    Parameters:
+    - start, end: Date range to aggregate
+    - frequency: One of 'Weekly', 'Monthly', 'Quarterly' or 'Per FOMC meeting'
+    - compare_meetings: With 'Per FOMC meeting', also plot the move announced at each meeting
+    """
+    fed_funds = load_file(FED_FUNDS_PATH)
+    change_df = net_moves(fed_funds['Change'], start, end, FREQUENCIES[frequency], meetings=fomc_meetings(FOMC_PATH).index)
+
+    legend_text = ['Net move in fed funds target']
+    if compare_meetings and frequency == 'Per FOMC meeting':
+        moves = fomc_meetings(FOMC_PATH)['RateMove'] / 100
+        change_df['FOMC'] = moves.reindex(pd.DatetimeIndex(change_df['Date'])).to_numpy()
+        legend_text.append('Move announced at the meeting')
+
+    st.image(render_chart('bars', change_df, title=title, legend_text_generator=tuple(legend_text), x_label=x_label,
+                          y_label=y_label, legend_loc=legend_loc, date_format=DATE_FORMATS[frequency], custom_text=custom_text))
+    st.dataframe(change_df[change_df.drop(columns='Date').ne(0).any(axis=1)], hide_index=True)
+
+# Streamlit app
+st.title("Fed Funds Rate Changes")
+
+fed_funds_dates = load_file(FED_FUNDS_PATH).index
+
+# Other inputs
+title = st.text_input("Plot Title", value="Change in fed funds rate target (%)")
+start = st.date_input("From Date", value=pd.to_datetime("2020-01-01"))
+end = st.date_input("To Date", value=fed_funds_dates.max())
+frequency = st.selectbox("Period", options=list(FREQUENCIES), index=1)
+compare_meetings = st.checkbox("Compare with FOMC announcements", value=False, disabled=frequency != 'Per FOMC meeting')
+x_label = st.text_input("X-axis Label", value="Date")
+y_label = st.text_input("Y-axis Label", value="Percent")
+legend_loc = st.selectbox("Legend Location", options=["lower right", "upper right", "upper left", "lower left"])
+custom_text = st.text_input("Custom Source Text", value="Source: Federal Reserve Economic Data")
+
+# Generate plot
+if st.button("Plot Rate Changes"):
+    if start > end:
+        st.error("The From Date must be before the To Date.")
+    else:
+        plot_rate_changes(start, end, frequency, title, x_label, y_label, compare_meetings, legend_loc, custom_text)
+
+# Hit/miss counters of the fetch, align, transform and render caches, shared by every session of this server
+if st.sidebar.checkbox("Show cache statistics", value=False):
+    st.sidebar.dataframe(pd.DataFrame(cache_stats()), hide_index=True)
@@ -0,0 +1,52 @@
+import streamlit as st
+import pandas as pd
+from fedplot.memo import cache_stats
+from fedplot.render import render_chart
+from fedplot.vintages import load_vintages
+
+# Every vintage of the monthly change in nonfarm payrolls (PAYEMS), from ALFRED
+table = load_vintages()
+
+def plot_as_of(vintage, from_date, title, y_label='Thousands of Persons'):
+    """Plots the series as published on ``vintage`` against its latest values."""
+    panel = pd.DataFrame({'Value_0': table.as_of(vintage), 'Value_1': table.latest()})
+    panel = panel[panel.index >= pd.Timestamp(from_date)].rename_axis('Date').reset_index()
+    st.image(render_chart('line', panel, title=title, legend_text_generator=[f"As of {vintage:%Y-%m-%d}", "Latest vintage"],
+                          x_label='Date', y_label=y_label, legend_loc='upper right',
+                          custom_text='Source: ALFRED, Federal Reserve Bank of St. Louis'))
+
+def plot_revisions(from_date, title, y_label='Thousands of Persons'):
+    """Plots the total revision (latest minus first release) of every month."""
+    comparison = table.first_vs_latest()
+    comparison = comparison[comparison.index >= pd.Timestamp(from_date)]
+    panel = comparison[['revision']].rename_axis('Date').reset_index()
+    st.image(render_chart('bars', panel, title=title, legend_text_generator=['Latest minus first release'],
+                          y_label=y_label, legend_loc='upper right', custom_text='Source: ALFRED, Federal Reserve Bank of St. Louis'))
+    st.dataframe(comparison)
+
+# Streamlit app
+st.title("Payroll Revisions")
+st.write(f"{len(table)} months x {len(table.vintages)} vintages of {table.name}, stored as {table.run_count} runs of unchanged values.")
+
+from_date = st.date_input("From Date", value=pd.to_datetime("2020-01-01"))
+
+st.header("Series as published")
+vintage = st.select_slider("Vintage", options=list(table.vintages), format_func=lambda v: f"{v:%Y-%m-%d}")
+plot_as_of(vintage, from_date, "Change in nonfarm payrolls by vintage")
+
+st.header("First release vs. latest")
+plot_revisions(from_date, "Revisions to the change in nonfarm payrolls")
+
+st.header("Revision history of a month")
+revisions = table.revisions(start=from_date)
+months = sorted(revisions['date'].unique())
+if months:
+    month = st.selectbox("Month", options=months, index=len(months) - 1, format_func=lambda d: f"{pd.Timestamp(d):%Y-%m}")
+    st.dataframe(table.history(month).rename('Value').rename_axis('Vintage').dropna())
+    st.dataframe(revisions[revisions['date'] == month], hide_index=True)
+else:
+    st.write("No month after the From Date was revised.")
+
+# Hit/miss counters of the fetch, align, transform and render caches, shared by every session of this server
+if st.sidebar.checkbox("Show cache statistics", value=False):
+    st.sidebar.dataframe(pd.DataFrame(cache_stats()), hide_index=True)
@@ -0,0 +1,29 @@
+import streamlit as st
+import pandas as pd
+from fedplot.charts import plot_projections
+from fedplot.memo import cache_stats
+from fedplot.projections import SEP_SERIES, fan, load_projections, releases, variables
+
+# Every SEP release in data/, each CSV parsed once per version
+table = load_projections()
+
+# Streamlit app
+st.title("FOMC Projections")
+
+release = st.selectbox("Release", options=releases(table), index=len(releases(table)) - 1, format_func=lambda r: r.strftime('%B %Y'))
+variable = st.selectbox("Variable", options=variables(table, release))
+from_date = st.date_input("From Date", value=pd.to_datetime("2015-01-01"))
+history = st.checkbox("FRED history", value=variable in SEP_SERIES,
+                      help="Plot the matching FRED series before the projections instead of the actuals published with the release")
+
+if st.button("Plot"):
+    st.image(plot_projections(variable, f"FOMC projections: {variable}", release=release, from_date=from_date, history=history))
+
+    years, longer_run = fan(table, variable, release)
+    if longer_run is not None:
+        years = pd.concat([years, longer_run.rename('Longer run').to_frame().T])
+    st.dataframe(years)
+
+# Hit/miss counters of the fetch, align, transform and render caches, shared by every session of this server
+if st.sidebar.checkbox("Show cache statistics", value=False):
+    st.sidebar.dataframe(pd.DataFrame(cache_stats()), hide_index=True)
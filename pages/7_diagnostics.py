@@ -0,0 +1,52 @@
+import streamlit as st
+import pandas as pd
+from fedplot import metrics
+from fedplot.memo import cache_stats
+
+# Spans and counters recorded by every session of this server (see fedplot.metrics)
+spans = metrics.spans()
+
+# Streamlit app
+st.title("Diagnostics")
+st.write(f"{len(spans)} spans recorded (the latest {metrics.MAX_SPANS} are kept).")
+
+if spans.empty:
+    st.write("Nothing recorded yet. Plot something on another page first.")
+else:
+    stages = st.multiselect("Stages", options=list(metrics.STAGES), default=list(metrics.STAGES))
+    spans = spans[spans['stage'].isin(stages)]
+
+    st.header("Latency by stage")
+    st.dataframe(metrics.quantiles('stage', spans), hide_index=True)
+
+    st.header("Latency by series")
+    st.dataframe(metrics.quantiles(['stage', 'series'], spans).sort_values('p95', ascending=False), hide_index=True)
+
+    st.header("Over time")
+    window = st.selectbox("Window", options=["1min", "5min", "15min", "1h"], index=1)
+    quantile = st.radio("Latency", options=["p50", "p95"], horizontal=True)
+    group_by = st.radio("Group by", options=["Stage", "Series"], horizontal=True)
+    if group_by == "Stage":
+        groups = spans['stage']
+    else:
+        # One line per stage and series, e.g. "fetch FRED:UNRATE", for the slowest series by p95
+        groups = spans['stage'] + ' ' + spans['series'].fillna('-').astype(str)
+        count = max(groups.nunique(), 1)
+        top = st.number_input("Series shown", min_value=1, max_value=count, value=min(count, 10))
+        slowest = spans.groupby(groups)['seconds'].quantile(0.95).nlargest(top).index
+        spans, groups = spans[groups.isin(slowest)], groups[groups.isin(slowest)]
+    over_time = (spans.set_index('time').groupby(groups.to_numpy())['seconds']
+                 .resample(window).quantile(0.5 if quantile == 'p50' else 0.95)
+                 .unstack(0))
+    st.line_chart(over_time)
+
+st.header("Counters")
+counters = [{**c, 'labels': ', '.join(f"{k}={v}" for k, v in c['labels'].items())} for c in metrics.counters()]
+st.dataframe(pd.DataFrame(counters, columns=['name', 'labels', 'value']), hide_index=True)
+st.dataframe(pd.DataFrame(cache_stats()), hide_index=True)
+
+st.download_button("Prometheus metrics", metrics.prometheus(), file_name="fedplot.prom", mime="text/plain")
+st.download_button("Spans as JSON lines", metrics.json_lines(), file_name="fedplot-spans.jsonl", mime="application/x-ndjson")
+if st.button("Reset"):
+    metrics.reset()
+    st.rerun()
@@ -0,0 +1,20 @@
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def repo_root(monkeypatch):
+    # The pages read data/ relative to the working directory, as under `streamlit run app.py`
+    monkeypatch.chdir(ROOT)
+
+
+def test_projections_page_loads():
+    app = AppTest.from_file(os.path.join(ROOT, "pages", "6_projections.py")).run()
+    assert not app.exception
+    assert app.selectbox[0].options